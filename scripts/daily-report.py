@@ -17,6 +17,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 from collections import defaultdict
+from operator import itemgetter
 
 # 添加脚本目录到路径
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,17 +25,22 @@ sys.path.insert(0, script_dir)
 
 from utils import (
     GitAnalyzer, ChurnAnalyzer, ReworkAnalyzer, HotspotAnalyzer,
-    HealthScoreCalculator, load_config, format_number,
+    HealthScoreCalculator, WorkingHours, load_config, format_number, run_analyses,
     is_late_night, is_weekend, is_overtime, calculate_message_quality,
     parse_iso_datetime
 )
 
+# 按字段求和时使用 C 实现的取值函数，避免逐条执行生成器表达式
+get_added = itemgetter('lines_added')
+get_deleted = itemgetter('lines_deleted')
+
 
 class DailyReportGenerator:
     """日报生成器"""
 
     def __init__(self, config_path: str, report_date: str = None):
         self.config = load_config(config_path)
+        self.working_hours = WorkingHours(self.config)  # 逐条提交判断深夜/加班时复用
         self.report_date = report_date or datetime.now().strftime("%Y-%m-%d")
 
         # 计算查询的时间范围
@@ -43,6 +49,7 @@ class DailyReportGenerator:
         self.until_time = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d 00:00:00")
 
         self.analyzers = self._init_analyzers()
+        self._analyses = None  # 震荡/返工/高危分析结果，见 _get_analyses
 
     def _init_analyzers(self) -> list:
         """初始化所有仓库的分析器"""
@@ -71,6 +78,12 @@ class DailyReportGenerator:
                 })
         return analyzers
 
+    def _get_analyses(self) -> list:
+        """各仓库的震荡/返工/高危分析结果（首次使用时所有仓库并行计算）"""
+        if self._analyses is None:
+            self._analyses = run_analyses(self.analyzers)
+        return self._analyses
+
     def generate(self) -> str:
         """生成日报"""
         report = []
@@ -163,11 +176,13 @@ class DailyReportGenerator:
         large_commits = 0
         tiny_commits = 0
         repo_stats = []
+        large_commit = self.config['thresholds']['large_commit']
+        tiny_commit = self.config['thresholds']['tiny_commit']
 
         for analyzer in self.analyzers:
             commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            repo_added = sum(c['lines_added'] for c in commits)
-            repo_deleted = sum(c['lines_deleted'] for c in commits)
+            repo_added = sum(map(get_added, commits))
+            repo_deleted = sum(map(get_deleted, commits))
 
             if commits:
                 repo_stats.append({
@@ -181,9 +196,9 @@ class DailyReportGenerator:
                 # 统计大提交和微小提交
                 for commit in commits:
                     total_change = commit['lines_added'] + commit['lines_deleted']
-                    if total_change > self.config['thresholds']['large_commit']:
+                    if total_change > large_commit:
                         large_commits += 1
-                    elif total_change < self.config['thresholds']['tiny_commit']:
+                    elif total_change < tiny_commit:
                         tiny_commits += 1
 
             total_added += repo_added
@@ -248,8 +263,8 @@ class DailyReportGenerator:
         total_churn_rate = 0
         repo_count = 0
 
-        for analyzer in self.analyzers:
-            churn_files, churn_rate = analyzer['churn'].analyze()
+        for analyzer, analysis in zip(self.analyzers, self._get_analyses()):
+            churn_files, churn_rate = analysis['churn']
             if churn_files or churn_rate > 0:
                 all_churn_files.extend([{**f, 'repo': analyzer['name']} for f in churn_files])
                 total_churn_rate += churn_rate
@@ -292,8 +307,8 @@ class DailyReportGenerator:
         total_rework = 0
         total_added_for_rework = 0
 
-        for analyzer in self.analyzers:
-            rework_lines, added_lines, rework_rate = analyzer['rework'].analyze()
+        for analysis in self._get_analyses():
+            rework_lines, added_lines, rework_rate = analysis['rework']
             total_rework += rework_lines
             total_added_for_rework += added_lines
 
@@ -316,8 +331,8 @@ class DailyReportGenerator:
         lines.append("")
 
         all_hotspots = []
-        for analyzer in self.analyzers:
-            hotspots = analyzer['hotspot'].analyze()
+        for analyzer, analysis in zip(self.analyzers, self._get_analyses()):
+            hotspots = analysis['hotspot']
             all_hotspots.extend([{**h, 'repo': analyzer['name']} for h in hotspots])
 
         all_hotspots.sort(key=lambda x: x['risk_score'], reverse=True)
@@ -356,7 +371,7 @@ class DailyReportGenerator:
         for analyzer in self.analyzers:
             commits = analyzer['git'].get_commits(self.since_time, self.until_time)
             for commit in commits:
-                if is_late_night(commit['date'], self.config):
+                if is_late_night(commit['date'], self.working_hours):
                     late_night_commits.append({
                         'author': commit['author'],
                         'time': commit['date'],
@@ -368,7 +383,7 @@ class DailyReportGenerator:
                         'time': commit['date'],
                         'repo': analyzer['name']
                     })
-                if is_overtime(commit['date'], self.config):
+                if is_overtime(commit['date'], self.working_hours):
                     overtime_commits.append({
                         'author': commit['author'],
                         'time': commit['date'],
@@ -458,6 +473,7 @@ class DailyReportGenerator:
         all_commits = []
         late_night = 0
         weekend = 0
+        large_commit = self.config['thresholds']['large_commit']
 
         for analyzer in self.analyzers:
             commits = analyzer['git'].get_commits(self.since_time, self.until_time)
@@ -466,9 +482,9 @@ class DailyReportGenerator:
 
             for commit in commits:
                 total_change = commit['lines_added'] + commit['lines_deleted']
-                if total_change > self.config['thresholds']['large_commit']:
+                if total_change > large_commit:
                     large_commits += 1
-                if is_late_night(commit['date'], self.config):
+                if is_late_night(commit['date'], self.working_hours):
                     late_night += 1
                 if is_weekend(commit['date']):
                     weekend += 1
@@ -480,10 +496,10 @@ class DailyReportGenerator:
 
         all_hotspots = []
 
-        for analyzer in self.analyzers:
-            churn_files, churn_rate = analyzer['churn'].analyze()
-            rework_lines, added_lines, rework_rate = analyzer['rework'].analyze()
-            hotspots = analyzer['hotspot'].analyze()
+        for analysis in self._get_analyses():
+            churn_files, churn_rate = analysis['churn']
+            rework_lines, added_lines, rework_rate = analysis['rework']
+            hotspots = analysis['hotspot']
 
             total_churn_rate += churn_rate
             total_rework_rate += rework_rate
@@ -622,8 +638,8 @@ class DailyReportGenerator:
         lines = []
 
         for author, commits in sorted(author_commits.items()):
-            author_added = sum(c['lines_added'] for c in commits)
-            author_deleted = sum(c['lines_deleted'] for c in commits)
+            author_added = sum(map(get_added, commits))
+            author_deleted = sum(map(get_deleted, commits))
             author_net = author_added - author_deleted
 
             lines.append(f"### 👤 {author}")
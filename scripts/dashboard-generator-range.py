@@ -784,7 +784,7 @@ def main():
             daily_files = sorted([f for f in glob.glob(os.path.join(reports_dir, '*.md'))
                                  if not os.path.basename(f).startswith('example')])
             if daily_files:
-                first_report_date = os.path.basename(daily_files[0]).replace('.md', '')
+                first_report_date = os.path.basename(daily_files[0])[:-3]
                 start_date = datetime.strptime(first_report_date, '%Y-%m-%d')
                 end_date = datetime.now()
                 days_count = (end_date.date() - start_date.date()).days + 1
@@ -815,7 +815,7 @@ def main():
         daily_files = sorted([f for f in glob.glob(os.path.join(reports_dir, '*.md'))
                              if not os.path.basename(f).startswith('example')])
         if daily_files:
-            first_report = os.path.basename(daily_files[0]).replace('.md', '')
+            first_report = os.path.basename(daily_files[0])[:-3]
             try:
                 project_start_date = datetime.strptime(first_report, '%Y-%m-%d').date()
                 project_days = (datetime.now().date() - project_start_date).days + 1
@@ -871,7 +871,8 @@ def main():
             continue
 
         git_analyzer = GitAnalyzer(repo['path'])
-        commits = git_analyzer.get_commits(since_time, until_time, branch="all")
+        # 每个仓库只遍历一次，边读取 git log 边统计，不缓存完整提交列表
+        commits = git_analyzer.iter_commits(since_time, until_time, branch="all")
 
         for commit in commits:
             try:
@@ -10,97 +10,18 @@ import glob
 from datetime import datetime
 from collections import defaultdict
 
-def generate_index():
-    """生成报告中心索引页面"""
-
-    # 获取报告目录
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    reports_dir = os.path.join(os.path.dirname(script_dir), 'reports')
-    daily_dir = os.path.join(reports_dir, 'daily')
-    weekly_dir = os.path.join(reports_dir, 'weekly')
-    monthly_dir = os.path.join(reports_dir, 'monthly')
-
-    # 确定当前年月和上月
-    now = datetime.now()
-    current_year_month = now.strftime('%Y-%m')  # 2026-01
-    if now.month == 1:
-        last_month_year = now.year - 1
-        last_month = 12
-    else:
-        last_month_year = now.year
-        last_month = now.month - 1
-    last_year_month = f"{last_month_year}-{last_month:02d}"  # 2025-12
-
-    # 获取当月日报
-    daily_files = glob.glob(os.path.join(daily_dir, '*.md'))
-    current_month_daily = []
-
-    for f in sorted(daily_files, reverse=True):  # 按日期倒序
-        filename = os.path.basename(f)
-        if filename.startswith('example'):  # 跳过示例文件
-            continue
-        date_str = filename.replace('.md', '')
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
-            year_month = date_str[:7]  # 2026-01
-            if year_month == current_year_month:
-                current_month_daily.append(date_str)
-        except ValueError:
-            continue
-
-    # 获取当月周报（当年的所有周报）
-    weekly_files = glob.glob(os.path.join(weekly_dir, '*.md'))
-    current_year_weekly = []
-    for f in sorted(weekly_files, reverse=True):
-        filename = os.path.basename(f)
-        if filename.startswith('example'):
-            continue
-        week_str = filename.replace('.md', '')
-        # 只显示当年的周报
-        if week_str.startswith(str(now.year)):
-            current_year_weekly.append(week_str)
-
-    # 获取上月月报
-    last_month_report = None
-    monthly_file = os.path.join(monthly_dir, f"{last_year_month}.md")
-    if os.path.exists(monthly_file):
-        last_month_report = last_year_month
+# 月份中文名 (1月..12月)
+_MONTH_CN = [f"{i}月" for i in range(1, 13)]
 
-    total_daily = len(current_month_daily)
-    total_weekly = len(current_year_weekly)
+# 报告链接片段 (链接由 前缀 + 名称 + 中段 + 显示名 + 后缀 拼接)
+_WEEKLY_LINK_PREFIX = '<a href="/reports/weekly/'
+_WEEKLY_LINK_MID = '.html" class="report-link week-link">📑 '
+_DAILY_LINK_PREFIX = '<a href="/reports/daily/'
+_DAILY_LINK_MID = '.html" class="report-link">'
+_LINK_SUFFIX = '</a>\n'
 
-    # 生成周报链接HTML
-    weekly_links_html = ""
-    for week in current_year_weekly:
-        weekly_links_html += f'<a href="/reports/weekly/{week}.html" class="report-link week-link">📑 {week}</a>\n'
-
-    # 生成当月日报HTML
-    year, month = current_year_month.split('-')
-    month_name = f"{year}年{int(month)}月"
-
-    daily_links = ""
-    for date_str in current_month_daily:
-        display = date_str[5:]  # MM-DD
-        daily_links += f'<a href="/reports/daily/{date_str}.html" class="report-link">{display}</a>\n'
-
-    # 生成上月月报HTML
-    monthly_section_html = ""
-    if last_month_report:
-        last_year, last_mon = last_year_month.split('-')
-        last_month_name = f"{last_year}年{int(last_mon)}月"
-        monthly_section_html = f'''
-        <div class="section">
-            <h2>📊 月报 ({last_month_name})</h2>
-            <div class="report-grid">
-                <a href="/reports/monthly/{last_year_month}.html" class="report-link month-link">📄 {last_year_month} 月报</a>
-            </div>
-        </div>
-'''
-
-    # 获取统计周期
-    period = f"{current_year_month} (当月)"
-
-    html_content = f'''<!DOCTYPE html>
+# 索引页面模板 (模块加载时构建一次，生成时只做占位符替换)
+INDEX_TEMPLATE = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -265,12 +186,115 @@ def generate_index():
         </div>
 
         <div class="footer">
-            由代码健康监控系统自动生成 | 更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+            由代码健康监控系统自动生成 | 更新时间: {updated_at}
         </div>
     </div>
 </body>
 </html>'''
 
+
+def _list_report_names(report_dir):
+    """列出目录下的报告名 (去掉 .md 后缀)，按名称倒序，跳过示例文件"""
+    names = []
+    for f in sorted(glob.glob(os.path.join(report_dir, '*.md')), reverse=True):
+        filename = os.path.basename(f)
+        if filename.startswith('example'):  # 跳过示例文件
+            continue
+        names.append(filename[:-3])  # 去掉 .md 后缀
+    return names
+
+
+def generate_index():
+    """生成报告中心索引页面"""
+
+    # 获取报告目录
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    reports_dir = os.path.join(os.path.dirname(script_dir), 'reports')
+    daily_dir = os.path.join(reports_dir, 'daily')
+    weekly_dir = os.path.join(reports_dir, 'weekly')
+    monthly_dir = os.path.join(reports_dir, 'monthly')
+
+    # 确定当前年月和上月
+    now = datetime.now()
+    current_year_month = now.strftime('%Y-%m')  # 2026-01
+    if now.month == 1:
+        last_month_year = now.year - 1
+        last_month = 12
+    else:
+        last_month_year = now.year
+        last_month = now.month - 1
+    last_year_month = f"{last_month_year}-{last_month:02d}"  # 2025-12
+
+    # 获取当月日报
+    current_month_daily = []
+    for date_str in _list_report_names(daily_dir):
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+            year_month = date_str[:7]  # 2026-01
+            if year_month == current_year_month:
+                current_month_daily.append(date_str)
+        except ValueError:
+            continue
+
+    # 获取当月周报（当年的所有周报）
+    current_year_weekly = [
+        week_str for week_str in _list_report_names(weekly_dir)
+        if week_str.startswith(str(now.year))  # 只显示当年的周报
+    ]
+
+    # 获取上月月报
+    last_month_report = None
+    monthly_file = os.path.join(monthly_dir, f"{last_year_month}.md")
+    if os.path.exists(monthly_file):
+        last_month_report = last_year_month
+
+    total_daily = len(current_month_daily)
+    total_weekly = len(current_year_weekly)
+
+    # 生成周报链接HTML
+    weekly_links_html = "".join(
+        _WEEKLY_LINK_PREFIX + week + _WEEKLY_LINK_MID + week + _LINK_SUFFIX
+        for week in current_year_weekly
+    )
+
+    # 生成当月日报HTML
+    year, month = current_year_month.split('-')
+    month_name = f"{year}年{_MONTH_CN[int(month) - 1]}"
+
+    daily_links = "".join(
+        _DAILY_LINK_PREFIX + date_str + _DAILY_LINK_MID + date_str[5:] + _LINK_SUFFIX  # MM-DD
+        for date_str in current_month_daily
+    )
+
+    # 生成上月月报HTML
+    monthly_section_html = ""
+    if last_month_report:
+        last_year, last_mon = last_year_month.split('-')
+        last_month_name = f"{last_year}年{_MONTH_CN[int(last_mon) - 1]}"
+        monthly_section_html = f'''
+        <div class="section">
+            <h2>📊 月报 ({last_month_name})</h2>
+            <div class="report-grid">
+                <a href="/reports/monthly/{last_year_month}.html" class="report-link month-link">📄 {last_year_month} 月报</a>
+            </div>
+        </div>
+'''
+
+    # 获取统计周期
+    period = f"{current_year_month} (当月)"
+
+    html_content = INDEX_TEMPLATE.format(
+        period=period,
+        total_daily=total_daily,
+        total_weekly=total_weekly,
+        month_name=month_name,
+        year=year,
+        monthly_section_html=monthly_section_html,
+        weekly_links_html=weekly_links_html,
+        daily_links=daily_links,
+        updated_at=datetime.now().strftime('%Y-%m-%d %H:%M'),
+    )
+
     # 保存index.html
     index_file = os.path.join(reports_dir, 'index.html')
     with open(index_file, 'w', encoding='utf-8') as f:
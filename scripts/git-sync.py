@@ -18,12 +18,19 @@ Examples:
     python git-sync.py                    # 拉取所有仓库
     python git-sync.py --branch dev       # 拉取指定分支
     python git-sync.py --dry-run          # 只显示计划
+    python git-sync.py --jobs 4           # 并发拉取的仓库数
+    python git-sync.py --per-host 2       # 同一远程主机的并发上限
 """
 
 import os
 import sys
+import json
+import time
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import urlparse
 
 # 添加脚本目录到路径
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -31,55 +38,292 @@ sys.path.insert(0, script_dir)
 
 from utils import load_config
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# 默认并发数：CPU 核数的 3/4，至少 2 个
+DEFAULT_JOBS = max(2, (os.cpu_count() or 4) * 3 // 4)
+
+# 单条 git 命令的超时时间（秒）
+GIT_TIMEOUT = 60
+
+# 同一远程主机同时进行的拉取数上限，避免被 Git 服务端限流
+DEFAULT_PER_HOST = 4
+
+# git status 加速配置，仅对本次调用生效，不修改仓库配置：
+# core.untrackedCache 缓存未跟踪文件扫描结果；core.fsmonitor 内置守护进程仅支持 macOS / Windows
+STATUS_CONFIG_ARGS = ["-c", "core.untrackedCache=true"]
+if sys.platform in ('darwin', 'win32'):
+    STATUS_CONFIG_ARGS += ["-c", "core.fsmonitor=true"]
+
+# 同步状态缓存：本地状态未变且距上次同步不超过 TTL 的仓库直接跳过
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'code-health', 'git-sync.json')
+DEFAULT_CACHE_TTL = 300
+
 
 class GitSync:
     """Git 同步工具"""
 
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, cache_ttl: int = DEFAULT_CACHE_TTL,
+                 per_host: int = DEFAULT_PER_HOST):
         self.config = load_config(config_path)
         self.repos = self.config['repositories']
+        self.cache_ttl = cache_ttl
+        self.per_host = max(1, per_host)
+        self._print_lock = threading.Lock()
+        self._host_lock = threading.Lock()
+        self._host_semaphores = {}
+        self._repo_cache = {}
+        self._sync_cache = self._load_cache() if cache_ttl > 0 else {}
+        # 每个仓库的 git 命令前缀只构建一次
+        self._argv_base = {repo['path']: ["git", "-C", repo['path']] for repo in self.repos}
+
+    def log(self, message: str):
+        """线程安全地输出一行日志"""
+        with self._print_lock:
+            print(message)
+
+    def _load_cache(self) -> dict:
+        """读取同步状态缓存"""
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-    def run_git_command(self, repo_path: str, command: list) -> tuple:
-        """执行 git 命令"""
+    def _save_cache(self):
+        """保存同步状态缓存"""
+        try:
+            os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+            with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self._sync_cache, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️  保存同步缓存失败: {e}")
+
+    def _repo_etag(self, repo_path: str) -> list:
+        """根据 .git 下 HEAD、当前分支引用、index、FETCH_HEAD 的修改时间生成仓库状态标识"""
+        git_dir = os.path.join(repo_path, '.git')
+        names = ['HEAD', 'index', 'FETCH_HEAD']
+        try:
+            with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as f:
+                head = f.read().strip()
+            if head.startswith('ref: '):
+                names.append(head[5:])
+        except OSError:
+            pass
+
+        etag = []
+        for name in names:
+            try:
+                etag.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+            except OSError:
+                etag.append(0)
+        return etag
+
+    @staticmethod
+    def _url_host(url: str) -> str:
+        """解析远程地址中的主机名"""
+        if '://' in url:
+            return urlparse(url).hostname or ''
+        # scp 风格地址: git@host:org/repo.git
+        host, sep, _ = url.partition(':')
+        return host.rpartition('@')[2] if sep else ''
+
+    def _remote_host(self, repo: dict) -> str:
+        """获取仓库远程地址的主机名
+
+        优先使用配置中的 url，其次使用同步状态缓存中记录的主机名，
+        都没有时才执行 git remote get-url 读取 origin，并记录到缓存
+        """
+        if repo.get('url'):
+            return self._url_host(repo['url'])
+
+        # 各仓库由不同线程写入不同的键
+        entry = self._sync_cache.setdefault(repo['path'], {})
+        if 'host' not in entry:
+            success, stdout, _ = self.run_git_command(repo['path'], ["remote", "get-url", "origin"])
+            if not success:
+                return ''
+            entry['host'] = self._url_host(stdout.strip())
+        return entry['host']
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        """获取远程主机对应的并发信号量"""
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._host_semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return semaphore
+
+    def _pull_with_host_limit(self, repo: dict, target_branch: str = None) -> dict:
+        """在远程主机并发上限内拉取仓库"""
+        host = self._remote_host(repo) if os.path.isdir(repo['path']) else ''
+        if not host:
+            return self.pull_repo(repo, target_branch)
+
+        semaphore = self._host_semaphore(host)
+        if not semaphore.acquire(blocking=False):
+            self.log(f"    [{repo['name']}] 等待 {host} 的连接空闲 (上限 {self.per_host})")
+            semaphore.acquire()
+        try:
+            return self.pull_repo(repo, target_branch)
+        finally:
+            semaphore.release()
+
+    def _sync_repo(self, repo: dict, target_branch: str = None, dry_run: bool = False) -> dict:
+        """同步单个仓库，本地状态未变且在缓存有效期内时跳过 git 调用"""
+        if dry_run:
+            return self.pull_repo(repo, target_branch, dry_run)
+        if self.cache_ttl <= 0:
+            return self._pull_with_host_limit(repo, target_branch)
+
+        branch = target_branch or repo.get('main_branch')
+        cached = self._sync_cache.get(repo['path'], {})
+        if (cached.get('branch') == branch
+                and time.time() - cached.get('synced_at', 0) < self.cache_ttl
+                and cached.get('etag') == self._repo_etag(repo['path'])):
+            return {
+                'name': repo['name'],
+                'path': repo['path'],
+                'success': True,
+                'message': '已是最新 (缓存)',
+                'changes': 0
+            }
+
+        result = self._pull_with_host_limit(repo, target_branch)
+        # 各仓库由不同线程写入不同的键
+        entry = self._sync_cache.setdefault(repo['path'], {})
+        if result['success']:
+            # pull_repo 仅在 fetch 及后续更新都成功时返回 success
+            entry.update(
+                branch=branch,
+                etag=self._repo_etag(repo['path']),
+                synced_at=time.time(),
+            )
+        else:
+            # 同步失败（如远程不可达）时作废旧记录，下次运行立即重试并重新读取远程地址
+            entry.pop('etag', None)
+            entry.pop('synced_at', None)
+            entry.pop('host', None)
+        return result
+
+    def run_git_command(self, repo_path: str, command: list, text: bool = True) -> tuple:
+        """执行 git 命令
+
+        Args:
+            repo_path: 仓库路径
+            command: git 子命令及参数
+            text: 为 False 时 stdout 以 bytes 返回，不做解码
+        """
+        argv_base = self._argv_base.get(repo_path) or ["git", "-C", repo_path]
         try:
             result = subprocess.run(
-                ["git", "-C", repo_path] + command,
+                argv_base + command,
                 capture_output=True,
-                text=True,
-                timeout=60
+                timeout=GIT_TIMEOUT
             )
-            return result.returncode == 0, result.stdout, result.stderr
         except Exception as e:
-            return False, "", str(e)
+            return False, "" if text else b"", str(e)
 
-    def get_current_branch(self, repo_path: str) -> str:
-        """获取当前分支"""
-        success, stdout, _ = self.run_git_command(repo_path, ["branch", "--show-current"])
-        return stdout.strip() if success else None
+        stdout = result.stdout.decode('utf-8', errors='replace') if text else result.stdout
+        return result.returncode == 0, stdout, result.stderr.decode('utf-8', errors='replace')
 
     def get_repo_status(self, repo_path: str) -> dict:
-        """获取仓库状态"""
+        """获取仓库状态
+
+        安装了 pygit2 时在进程内读取状态，否则（或读取失败时）调用 git 命令。
+        """
+        if pygit2 is not None:
+            try:
+                return self._get_repo_status_pygit2(repo_path)
+            except (pygit2.GitError, KeyError):
+                pass
+        return self._get_repo_status_cli(repo_path)
+
+    def _get_repo_status_pygit2(self, repo_path: str) -> dict:
+        """通过 pygit2 获取仓库状态 (无需启动 git 子进程)"""
+        repo = self._repo_cache.get(repo_path)
+        if repo is None:
+            repo = self._repo_cache[repo_path] = pygit2.Repository(repo_path)
+
         status = {
             'clean': True,
             'branch': None,
+            'upstream': None,
+            'ahead': 0,
+            'behind': 0,
             'uncommitted': 0,
             'untracked': 0
         }
 
-        # 获取当前分支
-        status['branch'] = self.get_current_branch(repo_path)
-
-        # 检查未提交的修改
-        success, stdout, _ = self.run_git_command(repo_path, ["status", "--porcelain"])
-        if success and stdout:
-            lines = stdout.strip().split('\n')
-            status['clean'] = False
-            for line in lines:
-                if line.startswith('??'):
-                    status['untracked'] += 1
-                else:
-                    status['uncommitted'] += 1
+        if not repo.head_is_detached and not repo.head_is_unborn:
+            status['branch'] = repo.head.shorthand
+            upstream = repo.branches.local[status['branch']].upstream
+            if upstream is not None:
+                status['upstream'] = upstream.shorthand
+                status['ahead'], status['behind'] = repo.ahead_behind(
+                    repo.head.target, upstream.target
+                )
+
+        for flags in repo.status(untracked_files='all').values():
+            if flags == pygit2.GIT_STATUS_WT_NEW:
+                status['untracked'] += 1
+            else:
+                status['uncommitted'] += 1
+
+        status['clean'] = not (status['uncommitted'] or status['untracked'])
+        return status
+
+    def _get_repo_status_cli(self, repo_path: str) -> dict:
+        """通过 git 命令获取仓库状态
+
+        使用 `git status --porcelain=v2 --branch` 一次性获取当前分支、
+        上游分支和工作区文件状态。
+        """
+        status = {
+            'clean': True,
+            'branch': None,
+            'upstream': None,
+            'ahead': 0,
+            'behind': 0,
+            'uncommitted': 0,
+            'untracked': 0
+        }
 
+        # -z 输出以 NUL 分隔记录，直接按 bytes 解析，避免解码整个输出
+        success, stdout, _ = self.run_git_command(
+            repo_path,
+            STATUS_CONFIG_ARGS + ["status", "--porcelain=v2", "-z", "--branch", "--untracked-files=all"],
+            text=False
+        )
+        if not success:
+            return status
+
+        records = iter(stdout.split(b'\0'))
+        for record in records:
+            kind = record[:1]
+            if kind == b'#':
+                # 头部信息: # branch.head <name> / # branch.upstream <name> / # branch.ab +X -Y
+                key, _, value = record[2:].decode('utf-8', errors='replace').partition(' ')
+                if key == 'branch.head' and value != '(detached)':
+                    status['branch'] = value
+                elif key == 'branch.upstream':
+                    status['upstream'] = value
+                elif key == 'branch.ab':
+                    ahead, _, behind = value.partition(' ')
+                    status['ahead'] = int(ahead.lstrip('+'))
+                    status['behind'] = int(behind.lstrip('-'))
+            elif kind == b'?':
+                status['untracked'] += 1
+            elif kind:
+                status['uncommitted'] += 1
+                if kind == b'2':
+                    # 重命名/复制记录后紧跟原路径字段
+                    next(records, None)
+
+        status['clean'] = not (status['uncommitted'] or status['untracked'])
         return status
 
     def pull_repo(self, repo: dict, target_branch: str = None, dry_run: bool = False) -> dict:
@@ -102,6 +346,14 @@ class GitSync:
             result['message'] = '不是 Git 仓库'
             return result
 
+        # 先更新远程分支信息，使后续状态中的 ahead/behind 反映远程最新提交
+        if not dry_run:
+            success, _, stderr = self.run_git_command(repo['path'], ["fetch", "--quiet"])
+            if not success:
+                # 远程分支信息未更新，behind 不可信，不能判定为已是最新
+                result['message'] = f"拉取失败: {stderr}"
+                return result
+
         # 获取当前状态
         status = self.get_repo_status(repo['path'])
 
@@ -117,22 +369,28 @@ class GitSync:
             result['success'] = True
             return result
 
+        # 已在目标分支且不落后于上游，无需 pull
+        if status['branch'] == branch and status['upstream'] and status['behind'] == 0:
+            result['message'] = "已是最新"
+            result['success'] = True
+            return result
+
         # 切换分支（如果需要）
         if status['branch'] != branch:
-            print(f"    切换分支: {status['branch']} -> {branch}")
+            self.log(f"    [{repo['name']}] 切换分支: {status['branch']} -> {branch}")
             success, _, stderr = self.run_git_command(repo['path'], ["checkout", branch])
             if not success:
                 result['message'] = f"切换分支失败: {stderr}"
                 return result
 
-        # 执行 git pull
-        success, stdout, stderr = self.run_git_command(repo['path'], ["pull", "--rebase"])
+        # 已 fetch 过，直接变基到上游分支（等同于 pull --rebase，但不再重复请求远程）
+        success, stdout, stderr = self.run_git_command(repo['path'], ["rebase", "--stat", "@{u}"])
 
         if success:
             result['success'] = True
 
             # 检查是否有更新
-            if "Already up to date" in stdout or "已经是最新" in stdout:
+            if "is up to date" in stdout or "Already up to date" in stdout or "已经是最新" in stdout:
                 result['message'] = "已是最新"
             else:
                 # 尝试统计变更文件数
@@ -149,8 +407,14 @@ class GitSync:
 
         return result
 
-    def sync_all(self, target_branch: str = None, dry_run: bool = False):
-        """同步所有仓库"""
+    def sync_all(self, target_branch: str = None, dry_run: bool = False, jobs: int = DEFAULT_JOBS):
+        """同步所有仓库
+
+        Args:
+            target_branch: 要拉取的分支，默认使用各仓库的 main_branch
+            dry_run: 干运行模式
+            jobs: 同时拉取的仓库数
+        """
         print("=" * 70)
         print("🔄 Git 仓库同步")
         print("=" * 70)
@@ -158,27 +422,38 @@ class GitSync:
         if dry_run:
             print("\n⚠️  干运行模式：不会实际拉取代码\n")
 
-        results = []
+        total = len(self.repos)
+        results = [None] * total
         success_count = 0
         skip_count = 0
         fail_count = 0
 
-        for i, repo in enumerate(self.repos, 1):
-            print(f"[{i}/{len(self.repos)}] 📦 {repo['name']}:")
+        # 仓库拉取以网络等待为主，使用有上限的线程池并发执行
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {
+                executor.submit(self._sync_repo, repo, target_branch, dry_run): index
+                for index, repo in enumerate(self.repos)
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[futures[future]] = result
+
+                if result['success']:
+                    if "已是最新" in result['message'] or "Already" in result['message']:
+                        line = f"  ⏭️  {result['message']}"
+                        skip_count += 1
+                    else:
+                        line = f"  ✅ {result['message']}"
+                        success_count += 1
+                else:
+                    line = f"  ❌ {result['message']}"
+                    fail_count += 1
 
-            result = self.pull_repo(repo, target_branch, dry_run)
-            results.append(result)
+                self.log(f"[{done}/{total}] 📦 {result['name']}:\n{line}")
 
-            if result['success']:
-                if "已是最新" in result['message'] or "Already" in result['message']:
-                    print(f"  ⏭️  {result['message']}")
-                    skip_count += 1
-                else:
-                    print(f"  ✅ {result['message']}")
-                    success_count += 1
-            else:
-                print(f"  ❌ {result['message']}")
-                fail_count += 1
+        if self.cache_ttl > 0 and not dry_run:
+            self._save_cache()
 
         # 总结
         print("\n" + "=" * 70)
@@ -211,6 +486,27 @@ def main():
         help='干运行模式，只显示计划不实际拉取'
     )
 
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'同时拉取的仓库数 (默认: {DEFAULT_JOBS})'
+    )
+
+    parser.add_argument(
+        '--per-host',
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f'同一远程主机同时拉取的仓库数上限 (默认: {DEFAULT_PER_HOST})'
+    )
+
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f'本地状态未变化的仓库在多少秒内不再重复拉取，0 表示禁用缓存 (默认: {DEFAULT_CACHE_TTL})'
+    )
+
     args = parser.parse_args()
 
     # 获取配置文件路径
@@ -218,8 +514,8 @@ def main():
     config_path = os.path.join(project_root, 'config.yaml')
 
     # 执行同步
-    sync = GitSync(config_path)
-    sync.sync_all(target_branch=args.branch, dry_run=args.dry_run)
+    sync = GitSync(config_path, cache_ttl=args.cache_ttl, per_host=args.per_host)
+    sync.sync_all(target_branch=args.branch, dry_run=args.dry_run, jobs=args.jobs)
 
 
 if __name__ == "__main__":
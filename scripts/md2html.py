@@ -3,103 +3,29 @@
 Markdown to HTML converter with beautiful styling
 Fixed: HTML escape for commit messages and other content
 """
+import os
 import sys
 import markdown
 import re
 import html
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def escape_html_in_content(md_content):
-    """转义markdown内容中的HTML特殊字符，但保留markdown语法
-    
-    主要处理：
-    1. commit message中的<>符号
-    2. 表格单元格中的<>符号
-    3. 其他非markdown语法的<>符号
-    """
-    
-    # 策略：先保护markdown语法标记，转义其他HTML字符，再恢复markdown标记
-    
-    # 1. 保护代码块（```代码块```）
-    code_blocks = []
-    def save_code_block(match):
-        code_blocks.append(match.group(0))
-        return f"___CODE_BLOCK_{len(code_blocks)-1}___"
-    
-    md_content = re.sub(r'```[\s\S]*?```', save_code_block, md_content)
-    
-    # 2. 保护行内代码（`代码`）
-    inline_codes = []
-    def save_inline_code(match):
-        inline_codes.append(match.group(0))
-        return f"___INLINE_CODE_{len(inline_codes)-1}___"
-    
-    md_content = re.sub(r'`[^`]+`', save_inline_code, md_content)
-    
-    # 3. 保护markdown链接 [text](url)
-    md_links = []
-    def save_md_link(match):
-        md_links.append(match.group(0))
-        return f"___MD_LINK_{len(md_links)-1}___"
-    
-    md_content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', save_md_link, md_content)
-    
-    # 4. 保护HTML注释
-    html_comments = []
-    def save_html_comment(match):
-        html_comments.append(match.group(0))
-        return f"___HTML_COMMENT_{len(html_comments)-1}___"
-    
-    md_content = re.sub(r'<!--[\s\S]*?-->', save_html_comment, md_content)
-    
-    # 5. 现在转义剩余的HTML特殊字符
-    # 只转义 < 和 >，因为这是最常见的问题
-    md_content = md_content.replace('<', '&lt;').replace('>', '&gt;')
-    
-    # 6. 恢复保护的内容
-    for i, comment in enumerate(html_comments):
-        md_content = md_content.replace(f"___HTML_COMMENT_{i}___", comment)
-    
-    for i, link in enumerate(md_links):
-        md_content = md_content.replace(f"___MD_LINK_{i}___", link)
-    
-    for i, code in enumerate(inline_codes):
-        md_content = md_content.replace(f"___INLINE_CODE_{i}___", code)
-    
-    for i, code in enumerate(code_blocks):
-        md_content = md_content.replace(f"___CODE_BLOCK_{i}___", code)
-    
-    return md_content
+# 需要原样保留的 markdown 片段 (按优先级)：代码块、行内代码、链接、HTML注释
+PROTECTED_RE = re.compile(
+    r'```[\s\S]*?```'
+    r'|`[^`]+`'
+    r'|\[[^\]]+\]\([^)]+\)'
+    r'|<!--[\s\S]*?-->'
+)
 
-def convert_md_to_html(md_file, html_file=None):
-    """Convert markdown file to HTML with CSS styling"""
-    
-    md_path = Path(md_file)
-    if not md_path.exists():
-        print(f"Error: File {md_file} not found")
-        return False
-    
-    if html_file is None:
-        html_file = md_path.with_suffix('.html')
-    
-    # Read markdown content
-    with open(md_path, 'r', encoding='utf-8') as f:
-        md_content = f.read()
-    
-    # Escape HTML special characters in content (but preserve markdown syntax)
-    md_content = escape_html_in_content(md_content)
-    
-    # Convert markdown to HTML
-    md_converter = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
-    html_body = md_converter.convert(md_content)
-    
-    # Get title from first heading or filename
-    title = md_path.stem.replace('-', ' ').title()
-    if md_content.startswith('# '):
-        title = md_content.split('\n')[0].replace('# ', '')
-    
-    # Create full HTML with styling
-    html_template = f"""<!DOCTYPE html>
+# 设置后，未指定输出路径的 HTML 写入该目录 (如 /dev/shm/code-health)，
+# 供需要立即上传/预览 HTML 的流水线使用，避免落盘再读回
+TMPFS_DIR_ENV = 'CODE_HEALTH_TMPFS_DIR'
+
+# HTML 页面模板：正文之前/之后的部分，模块加载时构建一次
+HTML_HEAD = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -329,28 +255,164 @@ def convert_md_to_html(md_file, html_file=None):
 </head>
 <body>
     <div class="container">
-        {html_body}
+        """
+
+HTML_TAIL = """
         <hr>
         <div class="meta-info">
-            Generated from: {md_path.name} | Report generated by Code Health Monitor
+            Generated from: {name} | Report generated by Code Health Monitor
         </div>
     </div>
 </body>
 </html>
 """
+
+# Markdown 转换器，所有文件共用一个实例，转换前 reset()
+_MD = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
+
+def escape_html_in_content(md_content):
+    """转义markdown内容中的HTML特殊字符，但保留markdown语法
+    
+    主要处理：
+    1. commit message中的<>符号
+    2. 表格单元格中的<>符号
+    3. 其他非markdown语法的<>符号
+    """
+    
+    # 策略：一次扫描切分出需要保留的markdown片段，只转义片段之间的普通文本
+    parts = []
+    last = 0
+    for match in PROTECTED_RE.finditer(md_content):
+        # 只转义 < 和 >，因为这是最常见的问题
+        parts.append(md_content[last:match.start()].replace('<', '&lt;').replace('>', '&gt;'))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(md_content[last:].replace('<', '&lt;').replace('>', '&gt;'))
+    
+    return ''.join(parts)
+
+def render_html(md_path):
+    """Render a markdown file to a full styled HTML page (returns the HTML string)"""
+    
+    # Read markdown content
+    with open(md_path, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+    
+    # Escape HTML special characters in content (but preserve markdown syntax)
+    md_content = escape_html_in_content(md_content)
+    
+    # Convert markdown to HTML
+    _MD.reset()
+    html_body = _MD.convert(md_content)
+    
+    # Get title from first heading or filename
+    title = md_path.stem.replace('-', ' ').title()
+    if md_content.startswith('# '):
+        title = md_content.split('\n')[0].replace('# ', '')
+    
+    # Create full HTML with styling
+    return (HTML_HEAD.format(title=title)
+            + html_body
+            + HTML_TAIL.format(name=md_path.name))
+
+def default_html_path(md_path):
+    """Default output path: same name with .html, placed in $CODE_HEALTH_TMPFS_DIR if usable"""
+    html_path = md_path.with_suffix('.html')
+    tmpfs_dir = os.environ.get(TMPFS_DIR_ENV)
+    if tmpfs_dir:
+        try:
+            os.makedirs(tmpfs_dir, exist_ok=True)
+        except OSError:
+            return html_path
+        if os.access(tmpfs_dir, os.W_OK):
+            return Path(tmpfs_dir) / html_path.name
+    return html_path
+
+def write_html(html_file, data):
+    """Atomically write encoded HTML: write a temp file next to the target, then rename"""
+    html_dir = os.path.dirname(os.path.abspath(html_file))
+    fd, tmp_path = tempfile.mkstemp(dir=html_dir, prefix='.md2html-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, html_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def convert_md_to_html(md_file, html_file=None):
+    """Convert markdown file to HTML with CSS styling"""
+    
+    md_path = Path(md_file)
+    if not md_path.exists():
+        print(f"Error: File {md_file} not found")
+        return False
+    
+    if html_file is None:
+        html_file = default_html_path(md_path)
     
     # Write HTML file
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_template)
+    write_html(html_file, render_html(md_path).encode('utf-8'))
     
     print(f"✅ Successfully converted: {md_file}")
     print(f"   Output: {html_file}")
     return True
 
+def convert_batch(md_files, write_workers=4):
+    """Convert several markdown files, reusing the same Markdown instance
+    
+    Markdown rendering runs on the calling thread while a small thread pool
+    writes finished pages, so disk writes overlap with the next conversion.
+
+    Returns:
+        dict: {'success': int, 'failed': int}
+    """
+    result = {'success': 0, 'failed': 0}
+    pending = []
+    
+    with ThreadPoolExecutor(max_workers=write_workers) as pool:
+        for md_file in md_files:
+            md_path = Path(md_file)
+            if not md_path.exists():
+                print(f"Error: File {md_file} not found")
+                result['failed'] += 1
+                continue
+            
+            html_file = default_html_path(md_path)
+            data = render_html(md_path).encode('utf-8')
+            pending.append((md_file, html_file, pool.submit(write_html, html_file, data)))
+        
+        for md_file, html_file, future in pending:
+            try:
+                future.result()
+            except OSError as e:
+                print(f"Error: Failed to write {html_file}: {e}")
+                result['failed'] += 1
+                continue
+            print(f"✅ Successfully converted: {md_file}")
+            print(f"   Output: {html_file}")
+            result['success'] += 1
+    
+    return result
+
+USAGE = f"""Usage: python3 md2html.py <markdown_file> [output_html_file]
+       python3 md2html.py --batch <markdown_file> [<markdown_file> ...]
+
+Environment:
+  {TMPFS_DIR_ENV}  Write HTML without an explicit output path into this
+                         directory (e.g. a tmpfs such as /dev/shm/code-health)
+                         instead of next to the markdown file"""
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 md2html.py <markdown_file> [output_html_file]")
-        sys.exit(1)
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
+        print(USAGE)
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+    
+    if sys.argv[1] == '--batch':
+        result = convert_batch(sys.argv[2:])
+        print(f"Converted: {result['success']} succeeded, {result['failed']} failed")
+        sys.exit(0 if result['failed'] == 0 else 1)
     
     md_file = sys.argv[1]
     html_file = sys.argv[2] if len(sys.argv) > 2 else None
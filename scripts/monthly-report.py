@@ -15,11 +15,15 @@ Examples:
 
 import os
 import sys
-import glob
+import json
 import re
+import heapq
+import hashlib
+import subprocess
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, Counter
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加脚本目录到路径
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,17 +31,41 @@ sys.path.insert(0, script_dir)
 
 from utils import (
     GitAnalyzer, ChurnAnalyzer, ReworkAnalyzer, HotspotAnalyzer,
-    HealthScoreCalculator, load_config, format_number,
+    HealthScoreCalculator, WorkingHours, load_config, format_number,
     is_late_night, is_weekend, calculate_message_quality,
     parse_iso_datetime
 )
 
+# 已结束月份的提交缓存目录（删除目录即可失效）
+# 缓存记录写入时所有引用指向的提交，月份结束后又有提交推送或变基时自动重新统计
+CACHE_DIR = os.path.join(os.path.dirname(script_dir), 'reports', '.cache')
+
+# 缓存格式版本，缓存内容的结构变化时递增
+CACHE_VERSION = 2
+
+# 月报统计的分支范围
+COMMIT_BRANCH = 'all'
+
+# 月报只用到作者和提交时间（文件统计始终返回），不读取提交说明等字段
+COMMIT_FIELDS = ('author', 'date')
+
+# 月份中文名（按月份序号索引）与排行榜奖牌
+_MONTH_NAMES = (
+    '', '一月', '二月', '三月', '四月', '五月', '六月',
+    '七月', '八月', '九月', '十月', '十一月', '十二月'
+)
+_MEDALS = ('🥇', '🥈', '🥉')
+
+# 周报文件名，如 2025-W48.md
+_WEEKLY_RE = re.compile(r'(\d{4})-W(\d{2})\.md')
+
 
 class MonthlyReportGenerator:
     """月报生成器"""
 
     def __init__(self, config_path: str, month_str: str = None):
         self.config = load_config(config_path)
+        self.working_hours = WorkingHours(self.config)  # 逐条提交判断深夜/加班时复用
 
         # 解析月份
         if month_str:
@@ -70,18 +98,19 @@ class MonthlyReportGenerator:
 
         self.analyzers = self._init_analyzers()
 
+        # 本月汇总统计，在 generate() 中计算一次
+        self.stats = {}
+
         # 加载本月的周报数据
         self.weekly_reports = self._load_weekly_reports()
 
     def _count_work_days(self) -> int:
         """计算当月工作日数量（周一到周五）"""
-        work_days = 0
-        current = self.month_start
-        while current <= self.month_end:
-            if current.weekday() < 5:  # 0-4 是周一到周五
-                work_days += 1
-            current += timedelta(days=1)
-        return work_days
+        total_days = (self.month_end.date() - self.month_start.date()).days + 1
+        first_weekday = self.month_start.weekday()
+        full_weeks, rem = divmod(total_days, 7)
+        # 整周各 5 个工作日，剩余天数逐个判断（0-4 是周一到周五）
+        return full_weeks * 5 + sum(1 for i in range(rem) if (first_weekday + i) % 7 < 5)
 
     def _init_analyzers(self) -> list:
         """初始化所有仓库的分析器"""
@@ -90,6 +119,7 @@ class MonthlyReportGenerator:
         for repo in self.config['repositories']:
             if os.path.exists(repo['path']):
                 git_analyzer = GitAnalyzer(repo['path'])
+                self._refresh_commit_graph(repo['name'], repo['path'])
                 analyzers.append({
                     'name': repo['name'],
                     'type': repo['type'],
@@ -120,6 +150,46 @@ class MonthlyReportGenerator:
         print(f"✅ 成功加载 {len(analyzers)}/{len(self.config['repositories'])} 个仓库")
         return analyzers
 
+    def _refresh_commit_graph(self, name: str, repo_path: str):
+        """commit-graph 缺失或过旧时，在后台重建以加速 git log
+
+        默认关闭，配置 thresholds.commit_graph_refresh_days 后开启。写入发生在被统计的仓库内，
+        应避免与 git-sync 同时运行。不等待子进程结束；本次运行的 git log 仍可正常执行，后续运行受益
+        """
+        refresh_days = self.config['thresholds'].get('commit_graph_refresh_days', 0)
+        if not refresh_days or refresh_days <= 0:
+            return
+
+        git_dir = os.path.join(repo_path, '.git')
+        if not os.path.isdir(git_dir):
+            git_dir = repo_path  # 裸仓库
+        info_dir = os.path.join(git_dir, 'objects', 'info')
+        if not os.path.isdir(os.path.dirname(info_dir)):
+            return
+
+        # 单文件 commit-graph 或拆分的 commit-graphs/commit-graph-chain，取最近更新的一个
+        mtimes = []
+        for graph_path in (os.path.join(info_dir, 'commit-graph'),
+                           os.path.join(info_dir, 'commit-graphs', 'commit-graph-chain')):
+            try:
+                mtimes.append(os.path.getmtime(graph_path))
+            except OSError:
+                pass  # 尚未生成
+
+        if mtimes and (datetime.now().timestamp() - max(mtimes)) / 86400 < refresh_days:
+            return
+
+        try:
+            subprocess.Popen(
+                ["git", "-C", repo_path, "commit-graph", "write",
+                 "--reachable", "--changed-paths", "--no-progress"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            print(f"   🔧 {name}: 后台更新 commit-graph")
+        except OSError as e:
+            print(f"   ⚠️  {name}: commit-graph 更新失败: {e}")
+
     def _load_weekly_reports(self) -> list:
         """加载本月的所有周报"""
         project_root = os.path.dirname(script_dir)
@@ -130,72 +200,300 @@ class MonthlyReportGenerator:
             return weekly_reports
 
         # 查找本月的周报文件
-        pattern = os.path.join(weekly_dir, f"{self.year}-W*.md")
-        for filepath in glob.glob(pattern):
-            filename = os.path.basename(filepath)
-            # 提取周数
-            match = re.match(r'(\d{4})-W(\d{2})\.md', filename)
-            if match:
-                weekly_reports.append({
-                    'filename': filename,
-                    'path': filepath,
-                    'week': int(match.group(2))
-                })
+        prefix = f"{self.year}-W"
+        with os.scandir(weekly_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not (filename.startswith(prefix) and filename.endswith('.md')):
+                    continue
+                # 提取周数
+                match = _WEEKLY_RE.match(filename)
+                if match:
+                    weekly_reports.append({
+                        'filename': filename,
+                        'path': entry.path,
+                        'week': int(match.group(2))
+                    })
 
         # 按周数排序
         weekly_reports.sort(key=lambda x: x['week'])
         return weekly_reports
 
-    def generate(self) -> str:
-        """生成月报"""
-        report = []
+    def _iter_all_commits(self):
+        """逐条产出本月所有仓库的提交（每个仓库只执行一次 git log）
+
+        git log 是阻塞的子进程调用，多仓库并行执行，按配置顺序产出；
+        汇总统计直接消费，不保留合并后的完整提交列表
+        """
+        if not self.analyzers:
+            return
+
+        max_workers = min(len(self.analyzers), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            repo_commits = executor.map(self._get_repo_commits, self.analyzers)
+            for analyzer, commits in zip(self.analyzers, repo_commits):
+                # get_commits 返回 GitAnalyzer 缓存的列表，补充字段写在浅拷贝上
+                for commit in commits:
+                    commit = dict(commit, repo=analyzer['name'])
+                    self._annotate_commit(commit)
+                    yield commit
+
+    def _annotate_commit(self, commit: dict):
+        """入库时预先计算日期、深夜/周末标记和提交大小，后续统计直接读取"""
+        try:
+            commit_dt = parse_iso_datetime(commit['date'])
+        except ValueError:
+            commit_dt = None
+        commit['_dt'] = commit_dt
+        commit['_date_str'] = commit['date'][:10]  # YYYY-MM-DD
+        commit['_is_late_night'] = commit_dt is not None and is_late_night(commit_dt, self.working_hours)
+        commit['_is_weekend'] = commit_dt is not None and is_weekend(commit_dt)
+        commit['_size'] = commit['lines_added'] + commit['lines_deleted']
+
+    def _cache_path(self, analyzer: dict) -> str:
+        """仓库某月提交缓存文件路径
+
+        文件名包含仓库路径、分支、字段列表和缓存版本的摘要，
+        同名仓库或字段变化时不会读到其他配置写入的缓存
+        """
+        key = '\0'.join((
+            os.path.abspath(analyzer['git'].repo_path),
+            COMMIT_BRANCH,
+            ','.join(COMMIT_FIELDS),
+            str(CACHE_VERSION),
+        ))
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(CACHE_DIR, analyzer['name'], f"{self.month_str}-{digest}.json")
+
+    @staticmethod
+    def _ref_tips(analyzer: dict) -> str:
+        """仓库 HEAD 及所有引用指向的提交摘要，推送新提交或变基后随之变化；获取失败时返回空串"""
+        refs = analyzer['git'].run_git_command(["show-ref", "--head", "--hash"])
+        return hashlib.sha1(refs.encode('utf-8')).hexdigest() if refs else ''
+
+    def _get_repo_commits(self, analyzer: dict) -> list:
+        """获取单个仓库本月的提交
+
+        已结束的月份优先读取缓存，仓库引用与写入缓存时不一致则重新统计；未结束的月份不缓存
+        """
+        month_closed = self.month_end < datetime.now()
+        cache_path = self._cache_path(analyzer)
+        ref_tips = self._ref_tips(analyzer) if month_closed else ''
+
+        if ref_tips:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached['refs'] == ref_tips:
+                    return cached['commits']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        commits = analyzer['git'].get_commits(
+            self.since_time, self.until_time, COMMIT_BRANCH, fields=COMMIT_FIELDS
+        )
+
+        # 空结果可能是 git 执行失败，不写入缓存
+        if ref_tips and commits:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'refs': ref_tips, 'commits': commits}, f, ensure_ascii=False)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"⚠️  {analyzer['name']}: 写入提交缓存失败: {e}")
+
+        return commits
+
+    @staticmethod
+    def _week_of(date_str: str) -> tuple:
+        """计算日期所在自然周（与周报保持一致）
+        Returns: (周编号如 2025-W48, 该周周一)
+        """
+        commit_date = datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+        # 找到该日期所在周的周一
+        days_since_monday = commit_date.weekday()
+        week_start = commit_date - timedelta(days=days_since_monday)
+
+        # 计算这是一年中的第几周（从1月第一个周一开始计数）
+        jan1 = datetime(week_start.year, 1, 1)
+        days_to_first_monday = (7 - jan1.weekday()) % 7
+        if days_to_first_monday == 0 and jan1.weekday() != 0:
+            days_to_first_monday = 7
+        first_monday = jan1 + timedelta(days=days_to_first_monday if jan1.weekday() != 0 else 0)
+        week_num = ((week_start - first_monday).days // 7) + 1
+
+        return f"{week_start.year}-W{week_num:02d}", week_start
+
+    def _aggregate(self, commits) -> dict:
+        """单次遍历本月提交（可为迭代器），计算各章节需要的全部统计数据"""
+        stats = {
+            'total_commits': 0,
+            'total_added': 0,
+            'total_deleted': 0,
+            'daily_commits': defaultdict(int),
+            # 按作者统计（并列的计数器，避免为每个作者构建嵌套字典）
+            'author_commits': Counter(),
+            'author_added': Counter(),
+            'author_deleted': Counter(),
+            'author_files': Counter(),
+            'author_repos': defaultdict(set),
+            'weekly_stats': {},
+            'repo_authors': defaultdict(set),
+            'repo_commits': defaultdict(int),
+            'file_changes': defaultdict(int),
+            'total_size': 0,
+            # 风险提交（深夜与周末可能重叠）
+            'late_night': 0,
+            'weekend': 0,
+            'large': 0,
+            # 工作时间分布（互斥）
+            'normal_hours': 0,
+            'overtime_hours': 0,
+            'late_night_hours': 0,
+            'weekend_hours': 0,
+            # 提交粒度
+            'small_commits': 0,
+            'medium_commits': 0,
+            'large_commits': 0,
+        }
+        daily_commits = stats['daily_commits']
+        author_commits = stats['author_commits']
+        author_added = stats['author_added']
+        author_deleted = stats['author_deleted']
+        author_files = stats['author_files']
+        author_repos = stats['author_repos']
+        weekly_stats = stats['weekly_stats']
+        file_changes = stats['file_changes']
+        date_weeks = {}
+
+        for commit in commits:
+            author = commit['author']
+            repo = commit['repo']
+            added = commit['lines_added']
+            deleted = commit['lines_deleted']
+            size = commit['_size']
+            commit_dt = commit['_dt']
+            date_str = commit['_date_str']
+
+            stats['total_commits'] += 1
+            stats['total_added'] += added
+            stats['total_deleted'] += deleted
+            daily_commits[date_str] += 1
+
+            author_commits[author] += 1
+            author_added[author] += added
+            author_deleted[author] += deleted
+            author_files[author] += len(commit['files'])
+            author_repos[author].add(repo)
+
+            # 同一天的提交共用周计算结果
+            week = date_weeks.get(date_str)
+            if week is None:
+                week = date_weeks[date_str] = self._week_of(date_str)
+            w_stats = weekly_stats.get(week[0])
+            if w_stats is None:
+                w_stats = weekly_stats[week[0]] = {
+                    'start': week[1],
+                    'commits': 0,
+                    'added': 0,
+                    'deleted': 0,
+                    'authors': set()
+                }
+            w_stats['commits'] += 1
+            w_stats['added'] += added
+            w_stats['deleted'] += deleted
+            w_stats['authors'].add(author)
+
+            stats['repo_authors'][repo].add(author)
+            stats['repo_commits'][repo] += 1
+
+            for file_info in commit['files']:
+                file_changes[file_info['path']] += 1
+
+            # 风险与工作时间分布
+            late_night = commit['_is_late_night']
+            weekend = commit['_is_weekend']
+            if late_night:
+                stats['late_night'] += 1
+            if weekend:
+                stats['weekend'] += 1
+                stats['weekend_hours'] += 1
+            elif late_night:
+                stats['late_night_hours'] += 1
+            elif commit_dt is not None and commit_dt.hour >= 18:
+                stats['overtime_hours'] += 1
+            else:
+                stats['normal_hours'] += 1
+
+            # 提交粒度
+            stats['total_size'] += size
+            if size > 500:
+                stats['large'] += 1
+            if size < 50:
+                stats['small_commits'] += 1
+            elif size < 200:
+                stats['medium_commits'] += 1
+            else:
+                stats['large_commits'] += 1
+
+        return stats
+
+    def _iter_sections(self):
+        """逐段生成月报内容（段落之间以空行分隔）"""
+        self.stats = self._aggregate(self._iter_all_commits())
 
         # 标题
-        report.append(self._generate_header())
+        yield self._generate_header()
 
         # 一、月度总览
-        report.append("## 一、月度总览 📊")
-        report.append(self._generate_overview())
+        yield "## 一、月度总览 📊"
+        yield self._generate_overview()
+
+        # 没有可用仓库或本月没有任何提交时，跳过其余统计章节
+        # （保留总览表，发送脚本从中提取核心指标）
+        if not self.stats['total_commits']:
+            yield "本月无提交数据"
+            yield self._generate_footer()
+            return
 
         # 二、团队表现
-        report.append("## 二、团队表现 👥")
-        report.append(self._generate_team_performance())
+        yield "## 二、团队表现 👥"
+        yield self._generate_team_performance()
 
         # 三、趋势分析
-        report.append("## 三、趋势分析 📈")
-        report.append(self._generate_trends())
+        yield "## 三、趋势分析 📈"
+        yield self._generate_trends()
 
         # 四、健康指标
-        report.append("## 四、健康指标 ❤️")
-        report.append(self._generate_health_metrics())
+        yield "## 四、健康指标 ❤️"
+        yield self._generate_health_metrics()
 
         # 五、风险分析
-        report.append("## 五、风险分析 ⚠️")
-        report.append(self._generate_risk_analysis())
+        yield "## 五、风险分析 ⚠️"
+        yield self._generate_risk_analysis()
 
         # 六、代码质量
-        report.append("## 六、代码质量 💎")
-        report.append(self._generate_quality_metrics())
+        yield "## 六、代码质量 💎"
+        yield self._generate_quality_metrics()
 
         # 七、下月计划建议
-        report.append("## 七、下月计划建议 💡")
-        report.append(self._generate_recommendations())
+        yield "## 七、下月计划建议 💡"
+        yield self._generate_recommendations()
 
         # 底部
-        report.append(self._generate_footer())
+        yield self._generate_footer()
 
-        return '\n\n'.join(report)
+    def generate(self) -> str:
+        """生成月报"""
+        return '\n\n'.join(self._iter_sections())
 
     def _generate_header(self) -> str:
         """生成报告头部"""
-        month_names = {
-            1: '一月', 2: '二月', 3: '三月', 4: '四月',
-            5: '五月', 6: '六月', 7: '七月', 8: '八月',
-            9: '九月', 10: '十月', 11: '十一月', 12: '十二月'
-        }
-
         lines = [
-            f"# {self.year}年{month_names[self.month]} 代码健康月报",
+            f"# {self.year}年{_MONTH_NAMES[self.month]} 代码健康月报",
             "",
             f"**报告周期**: {self.month_start.strftime('%Y-%m-%d')} ~ {self.month_end.strftime('%Y-%m-%d')}",
             f"**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
@@ -208,36 +506,20 @@ class MonthlyReportGenerator:
     def _generate_overview(self) -> str:
         """生成月度总览"""
         lines = []
-
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
+        stats = self.stats
 
         # 统计数据
-        total_commits = len(all_commits)
-        total_added = sum(c['lines_added'] for c in all_commits)
-        total_deleted = sum(c['lines_deleted'] for c in all_commits)
+        total_commits = stats['total_commits']
+        total_added = stats['total_added']
+        total_deleted = stats['total_deleted']
         total_net = total_added - total_deleted
 
-        # 统计活跃开发者
-        active_authors = set(c['author'] for c in all_commits)
-
-        # 统计涉及仓库
-        active_repos = set(c['repo'] for c in all_commits)
-
-        # 按日统计
-        daily_commits = defaultdict(int)
-        for commit in all_commits:
-            date = commit['date'][:10]  # YYYY-MM-DD
-            daily_commits[date] += 1
+        # 活跃开发者与涉及仓库
+        active_authors = stats['author_commits']
+        active_repos = stats['repo_commits']
 
         # 最活跃的一天
+        daily_commits = stats['daily_commits']
         if daily_commits:
             most_active_day = max(daily_commits.items(), key=lambda x: x[1])
         else:
@@ -261,35 +543,7 @@ class MonthlyReportGenerator:
     def _generate_team_performance(self) -> str:
         """生成团队表现"""
         lines = []
-
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
-
-        # 按作者统计
-        author_stats = defaultdict(lambda: {
-            'commits': 0,
-            'added': 0,
-            'deleted': 0,
-            'net': 0,
-            'files': 0,
-            'repos': set()
-        })
-
-        for commit in all_commits:
-            author = commit['author']
-            author_stats[author]['commits'] += 1
-            author_stats[author]['added'] += commit['lines_added']
-            author_stats[author]['deleted'] += commit['lines_deleted']
-            author_stats[author]['net'] += (commit['lines_added'] - commit['lines_deleted'])
-            author_stats[author]['files'] += len(commit['files'])
-            author_stats[author]['repos'].add(commit['repo'])
+        stats = self.stats
 
         # 贡献排行榜
         lines.append("### 🏆 贡献排行榜")
@@ -298,13 +552,16 @@ class MonthlyReportGenerator:
         lines.append("|------|--------|---------|---------|---------|---------|--------|----------|")
 
         # 按提交次数排序
-        sorted_authors = sorted(author_stats.items(), key=lambda x: x[1]['commits'], reverse=True)
-        for rank, (author, stats) in enumerate(sorted_authors[:10], 1):
-            medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}"
+        top_authors = heapq.nlargest(10, stats['author_commits'].items(), key=lambda x: x[1])
+        for rank, (author, commits) in enumerate(top_authors, 1):
+            medal = _MEDALS[rank - 1] if rank <= 3 else str(rank)
+            added = stats['author_added'][author]
+            deleted = stats['author_deleted'][author]
             lines.append(
-                f"| {medal} | {author} | {stats['commits']} | "
-                f"{format_number(stats['added'])} | {format_number(stats['deleted'])} | "
-                f"{format_number(stats['net'])} | {stats['files']} | {len(stats['repos'])} |"
+                f"| {medal} | {author} | {commits} | "
+                f"{format_number(added)} | {format_number(deleted)} | "
+                f"{format_number(added - deleted)} | {stats['author_files'][author]} | "
+                f"{len(stats['author_repos'][author])} |"
             )
 
         # 协作统计
@@ -313,17 +570,12 @@ class MonthlyReportGenerator:
         lines.append("")
 
         # 统计多人协作的仓库
-        repo_authors = defaultdict(set)
-        for commit in all_commits:
-            repo_authors[commit['repo']].add(commit['author'])
+        repo_authors = stats['repo_authors']
+        repo_commits = stats['repo_commits']
 
         lines.append("| 仓库 | 贡献人数 | 提交次数 |")
         lines.append("|------|---------|---------|")
 
-        repo_commits = defaultdict(int)
-        for commit in all_commits:
-            repo_commits[commit['repo']] += 1
-
         for repo in sorted(repo_authors.keys()):
             authors_count = len(repo_authors[repo])
             commits_count = repo_commits[repo]
@@ -335,79 +587,32 @@ class MonthlyReportGenerator:
         """生成趋势分析"""
         lines = []
 
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
-
-        # 按周统计
-        weekly_stats = defaultdict(lambda: {
-            'commits': 0,
-            'added': 0,
-            'deleted': 0,
-            'authors': set()
-        })
-
-        for commit in all_commits:
-            commit_date = datetime.strptime(commit['date'][:10], '%Y-%m-%d')
-
-            # 使用自然周计算（与周报保持一致）
-            # 找到该日期所在周的周一
-            days_since_monday = commit_date.weekday()
-            week_start = commit_date - timedelta(days=days_since_monday)
-
-            # 计算这是一年中的第几周（从1月第一个周一开始计数）
-            jan1 = datetime(week_start.year, 1, 1)
-            days_to_first_monday = (7 - jan1.weekday()) % 7
-            if days_to_first_monday == 0 and jan1.weekday() != 0:
-                days_to_first_monday = 7
-            first_monday = jan1 + timedelta(days=days_to_first_monday if jan1.weekday() != 0 else 0)
-            week_num = ((week_start - first_monday).days // 7) + 1
-
-            week_key = f"{week_start.year}-W{week_num:02d}"
-
-            weekly_stats[week_key]['commits'] += 1
-            weekly_stats[week_key]['added'] += commit['lines_added']
-            weekly_stats[week_key]['deleted'] += commit['lines_deleted']
-            weekly_stats[week_key]['authors'].add(commit['author'])
+        # 按周统计（自然周，与周报保持一致）
+        weekly_stats = self.stats['weekly_stats']
 
         lines.append("### 📊 每周趋势对比")
         lines.append("")
         lines.append("| 周 | 提交次数 | 代码新增 | 代码删除 | 净增 | 活跃人数 |")
         lines.append("|----|---------|---------|---------|------|---------|")
 
+        # 本月第一个周一，用于计算本月第几周
+        month_first_day = datetime(self.year, self.month, 1)
+        days_to_monday = (7 - month_first_day.weekday()) % 7
+        if days_to_monday == 0 and month_first_day.weekday() != 0:
+            days_to_monday = 7
+        month_first_monday = month_first_day + timedelta(days=days_to_monday if month_first_day.weekday() != 0 else 0)
+
         for week in sorted(weekly_stats.keys()):
             stats = weekly_stats[week]
             net = stats['added'] - stats['deleted']
 
             # 将周号转换为更友好的显示格式：第N周 (日期范围)
-            # 从 week_key (如 2025-W48) 计算出日期范围
-            year_str, week_num_str = week.split('-W')
-            year = int(year_str)
-            week_num = int(week_num_str)
-
-            # 计算该周的周一日期
-            jan1 = datetime(year, 1, 1)
-            days_to_first_monday = (7 - jan1.weekday()) % 7
-            if days_to_first_monday == 0 and jan1.weekday() != 0:
-                days_to_first_monday = 7
-            first_monday = jan1 + timedelta(days=days_to_first_monday if jan1.weekday() != 0 else 0)
-            week_start = first_monday + timedelta(weeks=week_num - 1)
+            week_start = stats['start']
             week_end = week_start + timedelta(days=6)
 
             # 判断这周是当月的第几周
             if week_start.month == self.month:
                 # 计算是本月第几周
-                month_first_day = datetime(self.year, self.month, 1)
-                days_to_monday = (7 - month_first_day.weekday()) % 7
-                if days_to_monday == 0 and month_first_day.weekday() != 0:
-                    days_to_monday = 7
-                month_first_monday = month_first_day + timedelta(days=days_to_monday if month_first_day.weekday() != 0 else 0)
                 month_week_num = ((week_start - month_first_monday).days // 7) + 1
 
                 week_label = f"第{month_week_num}周 ({week_start.strftime('%m/%d')}-{week_end.strftime('%m/%d')})"
@@ -432,25 +637,14 @@ class MonthlyReportGenerator:
     def _generate_health_metrics(self) -> str:
         """生成健康指标"""
         lines = []
-
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
+        stats = self.stats
+        total = stats['total_commits']
 
         # 计算月度健康评分 (简化版本)
-        if all_commits:
+        if total > 0:
             # 使用提交质量和工作时间分布估算健康分
-            late_night = len([c for c in all_commits if is_late_night(c['date'], self.config)])
-            weekend = len([c for c in all_commits if is_weekend(c['date'])])
-
             # 简单评分：正常工作时间提交占比
-            risk_ratio = (late_night + weekend) / len(all_commits) if all_commits else 0
+            risk_ratio = (stats['late_night'] + stats['weekend']) / total
             avg_score = max(60, 100 - risk_ratio * 50)  # 基础60分，风险越高扣分越多
         else:
             avg_score = 0
@@ -469,23 +663,11 @@ class MonthlyReportGenerator:
         lines.append("")
 
         # 工作时间分布
-        normal_hours = 0
-        overtime_hours = 0
-        late_night_hours = 0
-        weekend_hours = 0
-
-        for commit in all_commits:
-            commit_dt = parse_iso_datetime(commit['date'])
-            if is_weekend(commit['date']):
-                weekend_hours += 1
-            elif is_late_night(commit['date'], self.config):
-                late_night_hours += 1
-            elif commit_dt.hour >= 18:
-                overtime_hours += 1
-            else:
-                normal_hours += 1
+        normal_hours = stats['normal_hours']
+        overtime_hours = stats['overtime_hours']
+        late_night_hours = stats['late_night_hours']
+        weekend_hours = stats['weekend_hours']
 
-        total = len(all_commits)
         if total > 0:
             lines.append("### ⏰ 工作时间分布")
             lines.append("")
@@ -502,55 +684,33 @@ class MonthlyReportGenerator:
         """生成风险分析"""
         lines = []
 
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
-
         # 统计风险提交
-        late_night_commits = []
-        weekend_commits = []
-        large_commits = []
-
-        for commit in all_commits:
-            commit_dt = parse_iso_datetime(commit['date'])
-
-            if is_late_night(commit['date'], self.config):
-                late_night_commits.append(commit)
-
-            if is_weekend(commit['date']):
-                weekend_commits.append(commit)
-
-            if commit['lines_added'] + commit['lines_deleted'] > 500:
-                large_commits.append(commit)
+        late_night = self.stats['late_night']
+        weekend = self.stats['weekend']
+        large = self.stats['large']
 
         lines.append("### ⚠️ 风险提交统计")
         lines.append("")
         lines.append("| 风险类型 | 数量 | 占比 | 说明 |")
         lines.append("|---------|------|------|------|")
 
-        total = len(all_commits) if all_commits else 1
-        lines.append(f"| 深夜提交 (22:00-06:00) | {len(late_night_commits)} | {len(late_night_commits)/total*100:.1f}% | 可能影响代码质量 |")
-        lines.append(f"| 周末提交 | {len(weekend_commits)} | {len(weekend_commits)/total*100:.1f}% | 工作生活平衡问题 |")
-        lines.append(f"| 大型提交 (>500行) | {len(large_commits)} | {len(large_commits)/total*100:.1f}% | 难以审查 |")
+        total = self.stats['total_commits'] or 1
+        lines.append(f"| 深夜提交 (22:00-06:00) | {late_night} | {late_night/total*100:.1f}% | 可能影响代码质量 |")
+        lines.append(f"| 周末提交 | {weekend} | {weekend/total*100:.1f}% | 工作生活平衡问题 |")
+        lines.append(f"| 大型提交 (>500行) | {large} | {large/total*100:.1f}% | 难以审查 |")
 
         # 建议
         lines.append("")
         lines.append("### 💡 风险缓解建议")
         lines.append("")
 
-        if len(late_night_commits) / total > 0.1:
+        if late_night / total > 0.1:
             lines.append("- ⚠️ **深夜提交占比较高**: 建议调整工作节奏，避免疲劳编码")
 
-        if len(weekend_commits) / total > 0.15:
+        if weekend / total > 0.15:
             lines.append("- ⚠️ **周末提交占比较高**: 建议关注团队工作负荷，避免过度加班")
 
-        if len(large_commits) / total > 0.2:
+        if large / total > 0.2:
             lines.append("- ⚠️ **大型提交较多**: 建议拆分提交，提高代码审查效率")
 
         return '\n'.join(lines)
@@ -559,40 +719,28 @@ class MonthlyReportGenerator:
         """生成代码质量指标"""
         lines = []
 
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
+        stats = self.stats
+        total = stats['total_commits']
 
         # 提交粒度分析
-        commit_sizes = [c['lines_added'] + c['lines_deleted'] for c in all_commits]
-
-        if commit_sizes:
-            avg_size = sum(commit_sizes) / len(commit_sizes)
-            small_commits = len([s for s in commit_sizes if s < 50])
-            medium_commits = len([s for s in commit_sizes if 50 <= s < 200])
-            large_commits = len([s for s in commit_sizes if s >= 200])
+        if total > 0:
+            avg_size = stats['total_size'] / total
+            small_commits = stats['small_commits']
+            medium_commits = stats['medium_commits']
+            large_commits = stats['large_commits']
 
             lines.append("### 📏 提交粒度分析")
             lines.append("")
             lines.append("| 大小分类 | 数量 | 占比 | 建议 |")
             lines.append("|---------|------|------|------|")
-            lines.append(f"| 小型 (<50行) | {small_commits} | {small_commits/len(commit_sizes)*100:.1f}% | 最佳实践 ✅ |")
-            lines.append(f"| 中型 (50-200行) | {medium_commits} | {medium_commits/len(commit_sizes)*100:.1f}% | 合理范围 |")
-            lines.append(f"| 大型 (>200行) | {large_commits} | {large_commits/len(commit_sizes)*100:.1f}% | 建议拆分 |")
+            lines.append(f"| 小型 (<50行) | {small_commits} | {small_commits/total*100:.1f}% | 最佳实践 ✅ |")
+            lines.append(f"| 中型 (50-200行) | {medium_commits} | {medium_commits/total*100:.1f}% | 合理范围 |")
+            lines.append(f"| 大型 (>200行) | {large_commits} | {large_commits/total*100:.1f}% | 建议拆分 |")
             lines.append("")
             lines.append(f"**平均提交大小**: {avg_size:.1f} 行")
 
         # 文件修改热点
-        file_changes = defaultdict(int)
-        for commit in all_commits:
-            for file_info in commit['files']:
-                file_changes[file_info['path']] += 1
+        file_changes = stats['file_changes']
 
         if file_changes:
             lines.append("")
@@ -601,8 +749,8 @@ class MonthlyReportGenerator:
             lines.append("| 文件路径 | 修改次数 |")
             lines.append("|---------|---------|")
 
-            sorted_files = sorted(file_changes.items(), key=lambda x: x[1], reverse=True)
-            for filepath, count in sorted_files[:10]:
+            top_files = heapq.nlargest(10, file_changes.items(), key=lambda x: x[1])
+            for filepath, count in top_files:
                 lines.append(f"| `{filepath}` | {count} |")
 
         return '\n'.join(lines)
@@ -611,25 +759,16 @@ class MonthlyReportGenerator:
         """生成下月计划建议"""
         lines = []
 
-        # 收集本月所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
-
         lines.append("基于本月数据分析，建议下月重点关注：")
         lines.append("")
 
         # 计算一些关键指标
-        total = len(all_commits)
+        stats = self.stats
+        total = stats['total_commits']
         if total > 0:
-            late_night = len([c for c in all_commits if is_late_night(c['date'], self.config)])
-            weekend = len([c for c in all_commits if is_weekend(c['date'])])
-            large = len([c for c in all_commits if c['lines_added'] + c['lines_deleted'] > 500])
+            late_night = stats['late_night']
+            weekend = stats['weekend']
+            large = stats['large']
 
             lines.append("### 🎯 行动计划")
             lines.append("")
@@ -677,10 +816,10 @@ class MonthlyReportGenerator:
         filename = f"{self.month_str}.md"
         filepath = os.path.join(output_dir, filename)
 
-        report_content = self.generate()
-
+        # 先生成完整报告再写入：统计过程中出错时不会截断已有的月报文件
+        report = self.generate()
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+            f.write(report)
 
         print(f"✅ 月报已生成: {filepath}")
         return filepath
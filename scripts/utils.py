@@ -9,16 +9,36 @@ Created: 2025-12-30
 import os
 import re
 import subprocess
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterator, Iterable
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # 未编译 libyaml 时退回纯 Python 解析器
+    from yaml import SafeLoader as YamlLoader
 
+
+@lru_cache(maxsize=8192)
 def parse_iso_datetime(date_str: str) -> datetime:
-    """解析ISO格式日期时间字符串（兼容Python 3.6）"""
-    # 移除时区信息
-    date_str = date_str.replace(' +0800', '').replace('+0800', '')
-    # Python 3.6兼容的解析方式
+    """解析ISO格式日期时间字符串（同一时间字符串只解析一次）"""
+    # 移除时区信息（git --date=iso 输出以 " +0800" 结尾）
+    if date_str.endswith(' +0800'):
+        date_str = date_str[:-6]
+    elif '+0800' in date_str:
+        date_str = date_str.replace(' +0800', '').replace('+0800', '')
+
+    # 快速路径：标准的 YYYY-MM-DD HH:MM:SS / YYYY-MM-DDTHH:MM:SS 交给 C 实现的 fromisoformat
+    if len(date_str) == 19:
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+
     try:
         return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
     except ValueError:
@@ -26,12 +46,36 @@ def parse_iso_datetime(date_str: str) -> datetime:
         return datetime.strptime(date_str, '%Y-%m-%dT%H:%M:%S')
 
 
+# 按文件执行 git 查询时的默认并发数（子进程等待期间释放 GIL，线程即可）
+DEFAULT_FILE_WORKERS = (os.cpu_count() or 1) * 2
+
+# get_commits 支持的提交头字段及对应的 git log 格式占位符（顺序即输出顺序）
+COMMIT_HEADER_FIELDS = ('hash', 'author', 'email', 'date', 'message')
+COMMIT_HEADER_FORMATS = {
+    'hash': '%H',
+    'author': '%an',
+    'email': '%ae',
+    'date': '%ad',
+    'message': '%s',
+}
+
+
 class GitAnalyzer:
     """Git 仓库分析器"""
 
     def __init__(self, repo_path: str):
         self.repo_path = repo_path
         self.repo_name = os.path.basename(repo_path)
+        # 查询结果缓存：同一次运行中多个分析器/报告段落使用相同时间窗口时只执行一次 git log
+        self._cache = {}
+
+    def _cached(self, key: tuple, compute):
+        """按 key 缓存查询结果（调用方不应修改返回值）"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
 
     def run_git_command(self, command: List[str]) -> str:
         """执行 git 命令"""
@@ -40,24 +84,77 @@ class GitAnalyzer:
                 ["git", "-C", self.repo_path] + command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True,  # Python 3.6 兼容
                 check=True
             )
-            return result.stdout.strip()
+            # git 输出固定按 UTF-8 解码，不依赖运行环境的 locale（cron 下常为 ASCII）
+            return result.stdout.decode('utf-8', errors='replace').strip()
         except subprocess.CalledProcessError as e:
             print(f"Error in {self.repo_name}: {e}")
             return ""
 
-    def get_commits(self, since: str = "1 day ago", until: str = None, branch: str = "all") -> List[Dict]:
-        """获取提交记录"""
+    def run_git_command_stream(self, command: List[str]) -> Iterator[str]:
+        """执行 git 命令并逐行产出输出（不含换行符），不在内存中保留完整输出"""
+        args = ["git", "-C", self.repo_path] + command
+        try:
+            proc = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                encoding='utf-8',  # 同 run_git_command，不依赖 locale（Python 3.6 兼容）
+                errors='replace'
+            )
+        except OSError as e:
+            print(f"Error in {self.repo_name}: {e}")
+            return
+
+        with proc:
+            for line in proc.stdout:
+                yield line.rstrip('\n')
+
+        if proc.returncode:
+            print(f"Error in {self.repo_name}: {subprocess.CalledProcessError(proc.returncode, args)}")
+
+    def get_commits(self, since: str = "1 day ago", until: str = None, branch: str = "all",
+                    fields: Tuple[str, ...] = None, with_stats: bool = True) -> List[Dict]:
+        """获取提交记录
+
+        fields: 只输出指定的提交头字段（author/email/date/message），减少 git log 输出和解析量；
+                hash 始终返回，None 表示全部字段
+        with_stats: 是否统计文件变更（files/lines_added/lines_deleted），
+                    只用到提交头的调用方传 False，省去 --numstat 的输出和解析
+        """
+        if not with_stats:
+            # 同一窗口已有带文件统计的结果时直接复用，不再单独执行 git log
+            cached = self._cache.get(('commits', since, until, branch, fields, True))
+            if cached is not None:
+                return cached
+        key = ('commits', since, until, branch, fields, with_stats)
+        return self._cached(key, lambda: list(self.iter_commits(since, until, branch, fields, with_stats)))
+
+    def iter_commits(self, since: str = "1 day ago", until: str = None, branch: str = "all",
+                     fields: Tuple[str, ...] = None, with_stats: bool = True) -> Iterator[Dict]:
+        """逐条产出提交记录（参数同 get_commits）
+
+        边读取 git log 输出边解析，不在内存中保留完整输出
+        """
+        if fields is None:
+            header_fields = COMMIT_HEADER_FIELDS
+        else:
+            header_fields = ('hash',) + tuple(f for f in COMMIT_HEADER_FIELDS[1:] if f in fields)
+        # 提交头以 NUL 开头，与文件统计行（路径中可能含 |）区分
+        pretty = '%x00' + '|'.join(COMMIT_HEADER_FORMATS[f] for f in header_fields)
+        max_split = len(header_fields) - 1
+
         cmd = [
             "log",
             f"--since={since}",
-            "--pretty=format:%H|%an|%ae|%ad|%s",
-            "--date=iso",
-            "--numstat"
+            f"--pretty=format:{pretty}",
+            "--date=iso"
         ]
 
+        if with_stats:
+            cmd.append("--numstat")
+
         if until:
             cmd.insert(2, f"--until={until}")
 
@@ -66,59 +163,58 @@ class GitAnalyzer:
         else:
             cmd.append("--all")
 
-        output = self.run_git_command(cmd)
-        if not output:
-            return []
-
-        commits = []
-        lines = output.split('\n')
-        i = 0
-
-        while i < len(lines):
-            if '|' in lines[i]:
-                parts = lines[i].split('|')
-                commit = {
-                    'hash': parts[0],
-                    'author': parts[1],
-                    'email': parts[2],
-                    'date': parts[3],
-                    'message': parts[4] if len(parts) > 4 else '',
-                    'files': [],
-                    'lines_added': 0,
-                    'lines_deleted': 0
-                }
-
-                i += 1
+        commit = None
+        in_files = False
+        for line in self.run_git_command_stream(cmd):
+            if line.startswith('\0'):
+                if commit is not None:
+                    yield commit
+
+                # 限定分割次数，提交说明（最后一个字段）中的 | 原样保留
+                parts = line[1:].split('|', max_split)
+                if fields is None:
+                    commit = {
+                        'hash': parts[0],
+                        'author': parts[1],
+                        'email': parts[2],
+                        'date': parts[3],
+                        'message': parts[4] if len(parts) > 4 else '',
+                    }
+                else:
+                    commit = dict(zip(header_fields, parts))
+                if with_stats:
+                    commit['files'] = []
+                    commit['lines_added'] = 0
+                    commit['lines_deleted'] = 0
+                    in_files = True
+            elif not line:
+                # 空行结束当前提交的文件统计
+                in_files = False
+            elif in_files:
                 # 解析文件变更统计
-                while i < len(lines) and lines[i] and '|' not in lines[i]:
-                    parts = lines[i].split('\t')
-                    if len(parts) >= 3:
-                        added = parts[0] if parts[0] != '-' else 0
-                        deleted = parts[1] if parts[1] != '-' else 0
-                        filepath = parts[2]
-
-                        try:
-                            added = int(added)
-                            deleted = int(deleted)
-                        except:
-                            added = 0
-                            deleted = 0
-
-                        commit['files'].append({
-                            'path': filepath,
-                            'added': added,
-                            'deleted': deleted
-                        })
-                        commit['lines_added'] += added
-                        commit['lines_deleted'] += deleted
-
-                    i += 1
-
-                commits.append(commit)
-            else:
-                i += 1
-
-        return commits
+                parts = line.split('\t', 2)
+                if len(parts) >= 3:
+                    added = parts[0] if parts[0] != '-' else 0
+                    deleted = parts[1] if parts[1] != '-' else 0
+                    filepath = parts[2]
+
+                    try:
+                        added = int(added)
+                        deleted = int(deleted)
+                    except:
+                        added = 0
+                        deleted = 0
+
+                    commit['files'].append({
+                        'path': filepath,
+                        'added': added,
+                        'deleted': deleted
+                    })
+                    commit['lines_added'] += added
+                    commit['lines_deleted'] += deleted
+
+        if commit is not None:
+            yield commit
 
     def get_file_history(self, filepath: str, since: str = "7 days ago") -> List[Dict]:
         """获取文件修改历史"""
@@ -147,8 +243,48 @@ class GitAnalyzer:
 
         return history
 
+    def get_file_histories_bulk(self, since: str = "7 days ago") -> Dict[str, List[Dict]]:
+        """一次 git log 获取时间范围内所有文件的修改历史
+
+        返回 {文件路径: [{'hash', 'author', 'date'}]}，结果与逐个调用 get_file_history 一致，
+        避免每个文件单独执行一次 git log
+        """
+        return self._cached(('histories', since), lambda: self._read_file_histories(since))
+
+    def _read_file_histories(self, since: str) -> Dict[str, List[Dict]]:
+        """执行 git log 并按文件分组提交（get_file_histories_bulk 的实现）"""
+        cmd = [
+            "log",
+            f"--since={since}",
+            "--pretty=format:%x00%H|%an|%ad",  # 以 NUL 开头标记提交头，文件路径中不会出现
+            "--date=iso",
+            "--name-only",
+            "--no-renames"  # 重命名同时记到新旧路径下，与按路径查询的结果一致
+        ]
+
+        histories = defaultdict(list)
+        entry = None
+        for line in self.run_git_command_stream(cmd):
+            if not line:
+                continue
+            if line[0] == '\0':
+                parts = line[1:].split('|')
+                entry = {
+                    'hash': parts[0],
+                    'author': parts[1],
+                    'date': parts[2]
+                }
+            elif entry is not None:
+                histories[line].append(entry)
+
+        return dict(histories)
+
     def get_all_modified_files(self, since: str = "1 day ago") -> List[str]:
         """获取所有修改过的文件"""
+        return self._cached(('modified_files', since), lambda: self._read_modified_files(since))
+
+    def _read_modified_files(self, since: str) -> List[str]:
+        """执行 git log 列出修改过的文件（get_all_modified_files 的实现）"""
         cmd = [
             "log",
             f"--since={since}",
@@ -157,57 +293,55 @@ class GitAnalyzer:
             "--all"
         ]
 
-        output = self.run_git_command(cmd)
-        if not output:
-            return []
-
-        files = [f for f in output.split('\n') if f.strip()]
-        return list(set(files))
+        # dict.fromkeys 去重并保留首次出现顺序（最近修改的文件在前），结果顺序稳定
+        return list(dict.fromkeys(f for f in self.run_git_command_stream(cmd) if f.strip()))
 
     def get_file_size(self, filepath: str) -> int:
         """获取文件行数"""
         full_path = os.path.join(self.repo_path, filepath)
-        if not os.path.exists(full_path):
-            return 0
-
+        # 不存在的文件直接由 open 抛出异常，省去一次 stat
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return sum(1 for _ in f)
+            with open(full_path, 'rb') as f:
+                # 按块统计换行符，无需逐行解码
+                lines = 0
+                chunk = b''
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    lines += chunk.count(b'\n')
+                # 末行没有换行符时也算一行
+                if chunk and not chunk.endswith(b'\n'):
+                    lines += 1
+                return lines
         except:
             return 0
 
-    def get_file_authors(self, filepath: str, since: str = "7 days ago") -> set:
-        """获取文件的作者列表"""
-        history = self.get_file_history(filepath, since)
+    def get_file_authors(self, filepath: str, since: str = "7 days ago", history: List[Dict] = None) -> set:
+        """获取文件的作者列表（已查询过 history 时直接传入，避免重复执行 git log）"""
+        if history is None:
+            history = self.get_file_history(filepath, since)
         return set(h['author'] for h in history)
 
 
 class ChurnAnalyzer:
     """代码震荡分析器"""
 
-    def __init__(self, git_analyzer: GitAnalyzer, churn_days: int = 3, churn_count: int = 5):
+    def __init__(self, git_analyzer: GitAnalyzer, churn_days: int = 3, churn_count: int = 5,
+                 max_workers: int = DEFAULT_FILE_WORKERS):
         self.git_analyzer = git_analyzer
         self.churn_days = churn_days
         self.churn_count = churn_count
+        self.max_workers = max_workers
 
     def analyze(self) -> Tuple[List[Dict], float]:
         """分析代码震荡"""
         # 获取最近N天修改的所有文件
-        files = self.git_analyzer.get_all_modified_files(f"{self.churn_days} days ago")
-
-        churn_files = []
-        for filepath in files:
-            history = self.git_analyzer.get_file_history(filepath, f"{self.churn_days} days ago")
-            modify_count = len(history)
-
-            if modify_count >= self.churn_count:
-                authors = self.git_analyzer.get_file_authors(filepath, f"{self.churn_days} days ago")
-                churn_files.append({
-                    'file': filepath,
-                    'count': modify_count,
-                    'authors': list(authors),
-                    'size': self.git_analyzer.get_file_size(filepath)
-                })
+        since = f"{self.churn_days} days ago"
+        files = self.git_analyzer.get_all_modified_files(since)
+        histories = self.git_analyzer.get_file_histories_bulk(since)
+
+        # 每个文件的统计相互独立，并行执行
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda f: self._analyze_file(f, histories.get(f, [])), files)
+            churn_files = [r for r in results if r is not None]
 
         # 计算震荡率
         total_files = len(files) if files else 1
@@ -218,6 +352,21 @@ class ChurnAnalyzer:
 
         return churn_files, churn_rate
 
+    def _analyze_file(self, filepath: str, history: List[Dict]) -> Dict:
+        """分析单个文件，未达到震荡阈值时返回 None"""
+        modify_count = len(history)
+
+        if modify_count < self.churn_count:
+            return None
+
+        authors = self.git_analyzer.get_file_authors(filepath, history=history)
+        return {
+            'file': filepath,
+            'count': modify_count,
+            'authors': list(authors),
+            'size': self.git_analyzer.get_file_size(filepath)
+        }
+
 
 class ReworkAnalyzer:
     """返工率分析器"""
@@ -234,39 +383,40 @@ class ReworkAnalyzer:
         # 获取最近N天的提交
         commits = self.git_analyzer.get_commits(f"{self.add_days} days ago")
 
-        # 统计每个文件的新增和删除
-        file_changes = {}
+        # 统计每个文件的新增和删除，每次变更记为 (日期, 新增, 删除) 元组
+        file_changes = defaultdict(list)
         for commit in commits:
             commit_date = parse_iso_datetime(commit['date'])
 
             for file_info in commit['files']:
-                filepath = file_info['path']
-                if filepath not in file_changes:
-                    file_changes[filepath] = []
-
-                file_changes[filepath].append({
-                    'date': commit_date,
-                    'added': file_info['added'],
-                    'deleted': file_info['deleted']
-                })
+                file_changes[file_info['path']].append(
+                    (commit_date, file_info['added'], file_info['deleted'])
+                )
 
         # 检测返工：N天内新增，M天内被删除
         rework_lines = 0
         total_added = 0
+        # 间隔不足 M+1 天（即 .days <= M）的后续变更都在删除检测窗口内
+        window = timedelta(days=self.delete_days + 1)
+
+        for changes in file_changes.values():
+            if len(changes) == 1:
+                total_added += changes[0][1]
+                continue
 
-        for filepath, changes in file_changes.items():
-            changes.sort(key=lambda x: x['date'])
+            changes.sort(key=lambda x: x[0])
+            dates = [c[0] for c in changes]
+            deleted = [c[2] for c in changes]
 
-            for i, change in enumerate(changes):
-                total_added += change['added']
+            for i, (date, added, _) in enumerate(changes):
+                total_added += added
+                if not added:
+                    continue
 
-                # 检查这次新增是否在后续几天内被删除
-                for j in range(i + 1, len(changes)):
-                    days_diff = (changes[j]['date'] - change['date']).days
-                    if days_diff <= self.delete_days:
-                        # 简化计算：如果后续有删除，认为是部分返工
-                        estimated_rework = min(change['added'], changes[j]['deleted'])
-                        rework_lines += estimated_rework
+                # 已按时间排序，二分查找窗口右边界，窗口内的后续删除计为返工
+                end = bisect_left(dates, date + window, i + 1)
+                # 简化计算：如果后续有删除，认为是部分返工
+                rework_lines += sum([d if d < added else added for d in deleted[i + 1:end]])
 
         # 计算返工率
         rework_rate = (rework_lines / total_added * 100) if total_added > 0 else 0
@@ -277,49 +427,69 @@ class ReworkAnalyzer:
 class HotspotAnalyzer:
     """高危文件分析器"""
 
-    def __init__(self, git_analyzer: GitAnalyzer, config: Dict):
+    def __init__(self, git_analyzer: GitAnalyzer, config: Dict,
+                 max_workers: int = DEFAULT_FILE_WORKERS):
         self.git_analyzer = git_analyzer
         self.config = config
+        self.max_workers = max_workers
+
+        # 预先拆分排除规则，避免每个文件重复解析
+        exclude_patterns = config.get('exclude_patterns', [])
+        self._exclude_dirs = tuple(config.get('exclude_dirs', []))
+        self._exclude_exts = tuple(p[1:] for p in exclude_patterns if p.startswith('*.'))
+        self._exclude_subs = tuple(p for p in exclude_patterns if not p.startswith('*.'))
 
     def analyze(self) -> List[Dict]:
         """分析高危文件"""
         days = self.config.get('hotspot_days', 7)
-        files = self.git_analyzer.get_all_modified_files(f"{days} days ago")
+        since = f"{days} days ago"
+        files = self.git_analyzer.get_all_modified_files(since)
 
-        hotspots = []
-        for filepath in files:
-            # 跳过排除的文件
-            if self._should_exclude(filepath):
-                continue
+        # 跳过排除的文件
+        files = [f for f in files if not self._should_exclude(f)]
+        histories = self.git_analyzer.get_file_histories_bulk(since)
 
-            history = self.git_analyzer.get_file_history(filepath, f"{days} days ago")
-            modify_count = len(history)
-            file_size = self.git_analyzer.get_file_size(filepath)
-            authors = self.git_analyzer.get_file_authors(filepath, f"{days} days ago")
-
-            # 计算风险分数
-            risk_score = self._calculate_risk_score(modify_count, file_size, len(authors))
-
-            # 识别风险标签
-            tags = self._get_risk_tags(modify_count, file_size, len(authors), filepath)
-
-            if risk_score > 40:  # 只记录中等以上风险
-                hotspots.append({
-                    'file': filepath,
-                    'risk_score': risk_score,
-                    'modify_count': modify_count,
-                    'file_size': file_size,
-                    'author_count': len(authors),
-                    'authors': list(authors),
-                    'tags': tags,
-                    'suggestion': self._get_suggestion(tags, file_size)
-                })
+        # 每个文件的统计相互独立，并行执行
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda f: self._analyze_file(f, histories.get(f, [])), files)
+            hotspots = [r for r in results if r is not None]
 
         # 按风险分数排序
         hotspots.sort(key=lambda x: x['risk_score'], reverse=True)
 
         return hotspots
 
+    def _analyze_file(self, filepath: str, history: List[Dict]) -> Dict:
+        """分析单个文件，风险分数未超过阈值时返回 None"""
+        modify_count = len(history)
+        authors = self.git_analyzer.get_file_authors(filepath, history=history)
+
+        # 按文件大小满分估算上限，仍不超过阈值时无需读取文件
+        if self._calculate_risk_score(modify_count, 1000, len(authors)) <= 40:
+            return None
+
+        file_size = self.git_analyzer.get_file_size(filepath)
+
+        # 计算风险分数
+        risk_score = self._calculate_risk_score(modify_count, file_size, len(authors))
+
+        # 识别风险标签
+        tags = self._get_risk_tags(modify_count, file_size, len(authors), filepath)
+
+        if risk_score <= 40:  # 只记录中等以上风险
+            return None
+
+        return {
+            'file': filepath,
+            'risk_score': risk_score,
+            'modify_count': modify_count,
+            'file_size': file_size,
+            'author_count': len(authors),
+            'authors': list(authors),
+            'tags': tags,
+            'suggestion': self._get_suggestion(tags, file_size)
+        }
+
     def _calculate_risk_score(self, modify_count: int, file_size: int, author_count: int) -> float:
         """计算风险分数"""
         freq_score = min(modify_count / 10 * 100, 100)
@@ -366,24 +536,41 @@ class HotspotAnalyzer:
 
     def _should_exclude(self, filepath: str) -> bool:
         """判断是否应该排除此文件"""
-        exclude_patterns = self.config.get('exclude_patterns', [])
-        exclude_dirs = self.config.get('exclude_dirs', [])
-
         # 检查目录
-        for dir_pattern in exclude_dirs:
-            if dir_pattern in filepath:
-                return True
-
-        # 检查文件模式
-        for pattern in exclude_patterns:
-            if pattern.startswith('*.'):
-                ext = pattern[1:]
-                if filepath.endswith(ext):
-                    return True
-            elif pattern in filepath:
-                return True
+        if any(d in filepath for d in self._exclude_dirs):
+            return True
 
-        return False
+        # 检查文件模式：扩展名一次 endswith 判断，其余按子串匹配
+        return (filepath.endswith(self._exclude_exts)
+                or any(p in filepath for p in self._exclude_subs))
+
+
+def run_analyses(analyzers: List[Dict], max_workers: int = DEFAULT_FILE_WORKERS) -> List[Dict]:
+    """并行执行各仓库的震荡/返工/高危文件分析
+
+    analyzers 为报告脚本构造的 [{'churn', 'rework', 'hotspot', ...}] 列表，返回与之一一对应的
+    [{'churn': analyze() 结果, 'rework': ..., 'hotspot': ...}]；
+    分析耗时主要在 git 子进程，使用线程并行即可
+    """
+    kinds = ('churn', 'rework', 'hotspot')
+    if not analyzers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(len(analyzers) * len(kinds), max_workers)) as executor:
+        futures = [{kind: executor.submit(analyzer[kind].analyze) for kind in kinds}
+                   for analyzer in analyzers]
+    return [{kind: future.result() for kind, future in repo_futures.items()}
+            for repo_futures in futures]
+
+
+def fetch_commits(analyzers: List[Dict], since: str, until: str = None,
+                  max_workers: int = DEFAULT_FILE_WORKERS) -> List[List[Dict]]:
+    """并行获取各仓库同一时间窗口的提交记录，返回与 analyzers 一一对应的提交列表"""
+    if not analyzers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(len(analyzers), max_workers)) as executor:
+        return list(executor.map(lambda analyzer: analyzer['git'].get_commits(since, until), analyzers))
 
 
 class HealthScoreCalculator:
@@ -471,7 +658,7 @@ class HealthScoreCalculator:
 def load_config(config_path: str) -> Dict:
     """加载配置文件"""
     with open(config_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
 
 
 def format_number(num: int) -> str:
@@ -489,56 +676,102 @@ def get_time_range(hours: int = 24) -> str:
         return f"{hours} hours ago"
 
 
-def is_late_night(time_str: str, config: Dict) -> bool:
-    """判断是否深夜提交"""
-    try:
-        time = parse_iso_datetime(time_str)
+@lru_cache(maxsize=64)
+def _clock_hour(value: str) -> int:
+    """配置中的 HH:MM 时间点取小时（每个取值只解析一次）"""
+    return int(value.split(':')[0])
+
+
+@lru_cache(maxsize=64)
+def _clock_minutes(value: str) -> int:
+    """配置中的 HH:MM 时间点转换为当天分钟数（每个取值只解析一次）"""
+    hour, minute = map(int, value.split(':'))
+    return hour * 60 + minute
+
+
+class WorkingHours:
+    """配置中的深夜/加班时间段，解析一次后逐条提交只做整数比较"""
+
+    def __init__(self, config: Dict):
+        working_hours = config.get('working_hours', {})
+        try:
+            self.late_start = _clock_hour(working_hours['late_night_start'])
+            self.late_end = _clock_hour(working_hours['late_night_end'])
+        except (KeyError, ValueError, TypeError, AttributeError):
+            # 未配置或格式错误时不判定为深夜
+            self.late_start = self.late_end = None
+        try:
+            self.overtime_start = _clock_minutes(working_hours.get('overtime_start', '18:00'))
+            self.overtime_end = _clock_minutes(working_hours.get('overtime_end', '21:00'))
+        except (ValueError, TypeError, AttributeError):
+            self.overtime_start = self.overtime_end = None
+
+    def is_late_night(self, time: datetime) -> bool:
+        """判断时间是否在深夜时段"""
+        if self.late_start is None:
+            return False
         hour = time.hour
+        if self.late_start > self.late_end:  # 跨天
+            return hour >= self.late_start or hour < self.late_end
+        return self.late_start <= hour < self.late_end
 
-        late_start = int(config['working_hours']['late_night_start'].split(':')[0])
-        late_end = int(config['working_hours']['late_night_end'].split(':')[0])
+    def is_overtime(self, time: datetime) -> bool:
+        """判断时间是否在加班时段"""
+        if self.overtime_start is None:
+            return False
+        return self.overtime_start <= time.hour * 60 + time.minute < self.overtime_end
 
-        if late_start > late_end:  # 跨天
-            return hour >= late_start or hour < late_end
-        else:
-            return late_start <= hour < late_end
+
+def is_late_night(time_str, config) -> bool:
+    """判断是否深夜提交
+
+    time_str 也可以是已解析的 datetime；逐条判断时 config 传入预先构造的 WorkingHours
+    """
+    try:
+        time = time_str if isinstance(time_str, datetime) else parse_iso_datetime(time_str)
+        hours = config if isinstance(config, WorkingHours) else WorkingHours(config)
+        return hours.is_late_night(time)
     except:
         return False
 
 
-def is_weekend(time_str: str) -> bool:
-    """判断是否周末提交"""
+def is_weekend(time_str) -> bool:
+    """判断是否周末提交（time_str 也可以是已解析的 datetime）"""
     try:
-        time = parse_iso_datetime(time_str)
+        time = time_str if isinstance(time_str, datetime) else parse_iso_datetime(time_str)
         return time.weekday() >= 5  # 5=Saturday, 6=Sunday
     except:
         return False
 
 
-def is_overtime(time_str: str, config: Dict) -> bool:
+def is_overtime(time_str, config) -> bool:
     """判断是否加班时间提交
-    加班时间定义为: 18:00-21:00
+    加班时间定义为: 18:00-21:00（可配置），config 同 is_late_night
     """
     try:
-        time = parse_iso_datetime(time_str)
-        hour = time.hour
-        minute = time.minute
+        time = time_str if isinstance(time_str, datetime) else parse_iso_datetime(time_str)
+        hours = config if isinstance(config, WorkingHours) else WorkingHours(config)
+        return hours.is_overtime(time)
+    except:
+        return False
 
-        # 从配置读取加班时间段
-        overtime_start = config.get('working_hours', {}).get('overtime_start', '18:00')
-        overtime_end = config.get('working_hours', {}).get('overtime_end', '21:00')
 
-        start_hour, start_minute = map(int, overtime_start.split(':'))
-        end_hour, end_minute = map(int, overtime_end.split(':'))
+def count_off_hours(dates: Iterable[str], working_hours: WorkingHours) -> Dict[str, int]:
+    """一次遍历统计深夜/周末/加班提交数（每条提交只解析一次时间）"""
+    late_night = weekend = overtime = 0
+    for date_str in dates:
+        try:
+            time = parse_iso_datetime(date_str)
+        except:
+            continue
+        late_night += working_hours.is_late_night(time)
+        weekend += time.weekday() >= 5
+        overtime += working_hours.is_overtime(time)
+    return {'late_night': late_night, 'weekend': weekend, 'overtime': overtime}
 
-        # 转换为分钟进行比较
-        current_minutes = hour * 60 + minute
-        start_minutes = start_hour * 60 + start_minute
-        end_minutes = end_hour * 60 + end_minute
 
-        return start_minutes <= current_minutes < end_minutes
-    except:
-        return False
+# 规范的提交信息前缀（预编译，避免每条提交重复查找正则缓存）
+_GOOD_PREFIX = re.compile(r'^(feat|fix|refactor|docs|test|chore|style|perf)(\(.+\))?:')
 
 
 def calculate_message_quality(commits: List[Dict]) -> float:
@@ -546,16 +779,12 @@ def calculate_message_quality(commits: List[Dict]) -> float:
     if not commits:
         return 100.0
 
-    good_patterns = [
-        r'^(feat|fix|refactor|docs|test|chore|style|perf)(\(.+\))?:',
-        r'.{10,}',  # 至少10个字符
-    ]
-
     good_count = 0
     for commit in commits:
         message = commit.get('message', '')
-        is_good = any(re.match(pattern, message) for pattern in good_patterns)
-        if is_good:
+        # 至少10个字符（message 为单行标题），或规范前缀；
+        # 先做长度判断，多数提交无需进入正则引擎
+        if len(message) >= 10 or _GOOD_PREFIX.match(message):
             good_count += 1
 
     return (good_count / len(commits)) * 100
@@ -16,7 +16,9 @@ Examples:
 import os
 import sys
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import combinations, islice
+from operator import itemgetter
 
 # 添加脚本目录到路径
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,17 +26,32 @@ sys.path.insert(0, script_dir)
 
 from utils import (
     GitAnalyzer, ChurnAnalyzer, ReworkAnalyzer, HotspotAnalyzer,
-    HealthScoreCalculator, load_config, format_number,
-    is_late_night, is_weekend, calculate_message_quality,
+    HealthScoreCalculator, WorkingHours, load_config, format_number, run_analyses, fetch_commits,
+    count_off_hours, calculate_message_quality,
     parse_iso_datetime
 )
 
+# 按文件扩展名统计语言分布
+LANG_BY_EXT = {
+    '.java': 'Java',
+    '.py': 'Python',
+    '.vue': 'Vue/JS',
+    '.js': 'Vue/JS',
+    '.ts': 'Vue/JS',
+    '.dart': 'Dart',
+}
+
+# 工作时间分布的时段，及每个小时所属时段的下标
+TIME_SLOTS = ('00-06', '06-09', '09-12', '12-14', '14-18', '18-22', '22-24')
+SLOT_OF_HOUR = (0,) * 6 + (1,) * 3 + (2,) * 3 + (3,) * 2 + (4,) * 4 + (5,) * 4 + (6,) * 2
+
 
 class WeeklyReportGenerator:
     """周报生成器"""
 
     def __init__(self, config_path: str, week_str: str = None):
         self.config = load_config(config_path)
+        self.working_hours = WorkingHours(self.config)  # 逐条提交判断深夜/加班时复用
 
         # 解析周期 - 改用自然周（基于日期的周一到周日）
         if week_str:
@@ -92,6 +109,10 @@ class WeeklyReportGenerator:
         self.date_range_str = f"{self.week_start_date.strftime('%m月%d日')} - {self.week_end_date.strftime('%m月%d日')}"
 
         self.analyzers = self._init_analyzers()
+        self._analyses = None  # 震荡/返工/高危分析结果，见 _get_analyses
+        self._all_commits = None  # 本周所有提交，见 _get_all_commits
+        self._all_hotspots = None  # 本周所有高危文件，见 _get_all_hotspots
+        self._commit_size_counts = None  # (大提交数, 微小提交数)，见 _get_commit_size_counts
 
     def _init_analyzers(self) -> list:
         """初始化所有仓库的分析器"""
@@ -130,6 +151,59 @@ class WeeklyReportGenerator:
         print(f"✅ 成功加载 {len(analyzers)}/{len(self.config['repositories'])} 个仓库")
         return analyzers
 
+    def _get_analyses(self) -> list:
+        """各仓库的震荡/返工/高危分析结果（首次使用时所有仓库并行计算）"""
+        if self._analyses is None:
+            self._analyses = run_analyses(self.analyzers)
+        return self._analyses
+
+    def _get_all_commits(self) -> list:
+        """本周所有仓库的提交（带 repo 字段，首次使用时各仓库并行获取，各章节共用）
+
+        收集时预先解析提交时间存入 _dt，无法解析时为 None
+        """
+        if self._all_commits is None:
+            repo_commits = fetch_commits(self.analyzers, self.since_time, self.until_time)
+            self._all_commits = [
+                {**commit, 'repo': analyzer['name'], '_dt': self._parse_commit_time(commit['date'])}
+                for analyzer, commits in zip(self.analyzers, repo_commits)
+                for commit in commits
+            ]
+        return self._all_commits
+
+    @staticmethod
+    def _parse_commit_time(date_str: str):
+        """解析提交时间，格式不支持（如非 +0800 时区）时返回 None"""
+        try:
+            return parse_iso_datetime(date_str)
+        except ValueError:
+            return None
+
+    def _get_commit_size_counts(self) -> tuple:
+        """本周大提交/微小提交的数量（一次遍历，质量趋势与改进建议共用）"""
+        if self._commit_size_counts is None:
+            large_commit = self.config['thresholds']['large_commit']
+            tiny_commit = self.config['thresholds']['tiny_commit']
+            large_commits = tiny_commits = 0
+            for commit in self._get_all_commits():
+                total_change = commit['lines_added'] + commit['lines_deleted']
+                if total_change > large_commit:
+                    large_commits += 1
+                elif total_change < tiny_commit:
+                    tiny_commits += 1
+            self._commit_size_counts = (large_commits, tiny_commits)
+        return self._commit_size_counts
+
+    def _get_all_hotspots(self) -> list:
+        """所有仓库的高危文件（带 repo 字段，按仓库顺序，各章节共用）"""
+        if self._all_hotspots is None:
+            self._all_hotspots = [
+                {**h, 'repo': analyzer['name']}
+                for analyzer, analysis in zip(self.analyzers, self._get_analyses())
+                for h in analysis['hotspot']
+            ]
+        return self._all_hotspots
+
     def generate(self) -> str:
         """生成周报"""
         report = []
@@ -179,16 +253,9 @@ class WeeklyReportGenerator:
         lines = []
 
         # 收集本周所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
+        all_commits = self._get_all_commits()
 
-        # 按作者统计
+        # 按作者、按仓库统计（一次遍历完成所有聚合）
         author_stats = defaultdict(lambda: {
             'commits': 0,
             'added': 0,
@@ -197,26 +264,30 @@ class WeeklyReportGenerator:
             'repos': set(),
             'languages': defaultdict(int)
         })
+        repo_stats = defaultdict(lambda: {'added': 0, 'deleted': 0, 'commits': 0})
 
         for commit in all_commits:
-            author = commit['author']
-            author_stats[author]['commits'] += 1
-            author_stats[author]['added'] += commit['lines_added']
-            author_stats[author]['deleted'] += commit['lines_deleted']
-            author_stats[author]['files'] += len(commit['files'])
-            author_stats[author]['repos'].add(commit['repo'])
+            # 每条提交只查找一次统计字典，后续累加直接作用于该字典
+            stats = author_stats[commit['author']]
+            stats['commits'] += 1
+            stats['added'] += commit['lines_added']
+            stats['deleted'] += commit['lines_deleted']
+            stats['files'] += len(commit['files'])
+            stats['repos'].add(commit['repo'])
+
+            totals = repo_stats[commit['repo']]
+            totals['added'] += commit['lines_added']
+            totals['deleted'] += commit['lines_deleted']
+            totals['commits'] += 1
 
             # 统计语言（基于文件扩展名）
+            languages = stats['languages']
             for file_info in commit['files']:
                 filepath = file_info['path']
-                if filepath.endswith('.java'):
-                    author_stats[author]['languages']['Java'] += file_info['added']
-                elif filepath.endswith('.py'):
-                    author_stats[author]['languages']['Python'] += file_info['added']
-                elif filepath.endswith(('.vue', '.js', '.ts')):
-                    author_stats[author]['languages']['Vue/JS'] += file_info['added']
-                elif filepath.endswith('.dart'):
-                    author_stats[author]['languages']['Dart'] += file_info['added']
+                # 无扩展名时取到最后一个字符，不会命中映射表
+                lang = LANG_BY_EXT.get(filepath[filepath.rfind('.'):])
+                if lang is not None:
+                    languages[lang] += file_info['added']
 
         # 1. 提交量排行榜
         lines.append("### 1️⃣ 提交量排行榜")
@@ -224,15 +295,12 @@ class WeeklyReportGenerator:
         lines.append("| 排名 | 开发者 | 提交次数 | 新增行数 | 删除行数 | 净增行数 | 文件数 | 平均提交大小 | 涉及仓库 |")
         lines.append("|------|--------|---------|---------|---------|---------|--------|------------|----------|")
 
-        # 按净增行数排序
-        sorted_authors = sorted(
-            author_stats.items(),
-            key=lambda x: x[1]['added'] - x[1]['deleted'],
-            reverse=True
-        )
+        # 按净增行数排序（净增行数只计算一次，两张表共用）
+        sorted_authors = [(stats['added'] - stats['deleted'], author, stats)
+                          for author, stats in author_stats.items()]
+        sorted_authors.sort(key=itemgetter(0), reverse=True)
 
-        for rank, (author, stats) in enumerate(sorted_authors, 1):
-            net = stats['added'] - stats['deleted']
+        for rank, (net, author, stats) in enumerate(sorted_authors, 1):
             avg_commit_size = (stats['added'] + stats['deleted']) // stats['commits'] if stats['commits'] > 0 else 0
             repos_count = len(stats['repos'])
 
@@ -252,8 +320,7 @@ class WeeklyReportGenerator:
         lines.append("### 2️⃣ LOC 统计（代码贡献详情）")
         lines.append("")
 
-        for author, stats in sorted_authors:
-            net = stats['added'] - stats['deleted']
+        for net, author, stats in sorted_authors:
             efficiency = (net / stats['added'] * 100) if stats['added'] > 0 else 0
 
             lines.append(f"#### 👤 {author}")
@@ -269,7 +336,7 @@ class WeeklyReportGenerator:
             if stats['languages']:
                 total_lang_lines = sum(stats['languages'].values())
                 lines.append("**主要语言**:")
-                for lang, lines_count in sorted(stats['languages'].items(), key=lambda x: x[1], reverse=True):
+                for lang, lines_count in sorted(stats['languages'].items(), key=itemgetter(1), reverse=True):
                     percentage = (lines_count / total_lang_lines * 100) if total_lang_lines > 0 else 0
                     lines.append(f"- {lang}: {format_number(lines_count)} 行 ({percentage:.0f}%)")
                 lines.append("")
@@ -280,8 +347,8 @@ class WeeklyReportGenerator:
 
         # 3. 团队总产出
         total_commits = len(all_commits)
-        total_added = sum(c['lines_added'] for c in all_commits)
-        total_deleted = sum(c['lines_deleted'] for c in all_commits)
+        total_added = sum(stats['added'] for stats in repo_stats.values())
+        total_deleted = sum(stats['deleted'] for stats in repo_stats.values())
         total_net = total_added - total_deleted
         avg_efficiency = (total_net / total_added * 100) if total_added > 0 else 0
 
@@ -301,13 +368,6 @@ class WeeklyReportGenerator:
         lines.append("### 4️⃣ 仓库 LOC 分布")
         lines.append("")
 
-        repo_stats = defaultdict(lambda: {'added': 0, 'deleted': 0, 'commits': 0})
-        for commit in all_commits:
-            repo = commit['repo']
-            repo_stats[repo]['added'] += commit['lines_added']
-            repo_stats[repo]['deleted'] += commit['lines_deleted']
-            repo_stats[repo]['commits'] += 1
-
         lines.append("| 仓库 | 提交 | 新增 | 删除 | 净增 | 占比 |")
         lines.append("|------|------|------|------|------|------|")
 
@@ -336,18 +396,19 @@ class WeeklyReportGenerator:
         """生成高危文件分析"""
         lines = []
 
-        # 收集所有高危文件
-        all_hotspots = []
-        for analyzer in self.analyzers:
-            hotspots = analyzer['hotspot'].analyze()
-            all_hotspots.extend([{**h, 'repo': analyzer['name']} for h in hotspots])
-
-        all_hotspots.sort(key=lambda x: x['risk_score'], reverse=True)
+        # 收集所有高危文件（排序副本，共享列表保持仓库顺序）
+        all_hotspots = sorted(self._get_all_hotspots(), key=lambda x: x['risk_score'], reverse=True)
 
-        # 统计风险等级
-        critical_count = len([h for h in all_hotspots if h['risk_score'] >= 80])
-        high_count = len([h for h in all_hotspots if 60 <= h['risk_score'] < 80])
-        medium_count = len([h for h in all_hotspots if 40 <= h['risk_score'] < 60])
+        # 统计风险等级（一次遍历）
+        critical_count = high_count = medium_count = 0
+        for h in all_hotspots:
+            score = h['risk_score']
+            if score >= 80:
+                critical_count += 1
+            elif score >= 60:
+                high_count += 1
+            elif score >= 40:
+                medium_count += 1
 
         lines.append("### 1️⃣ 风险概览")
         lines.append("")
@@ -385,10 +446,8 @@ class WeeklyReportGenerator:
             lines.append("### 3️⃣ 严重风险文件详情")
             lines.append("")
 
-            for h in all_hotspots[:5]:
-                if h['risk_score'] < 80:
-                    break
-
+            # 已按风险分数降序排列，前 critical_count 个即为严重风险文件
+            for h in islice(all_hotspots, min(5, critical_count)):
                 lines.append(f"#### 🔴 {h['repo']}: `{h['file']}`")
                 lines.append("")
                 lines.append(f"**风险分数**: {h['risk_score']:.0f} / 100")
@@ -407,62 +466,38 @@ class WeeklyReportGenerator:
         lines = []
 
         # 收集本周所有提交
-        all_commits = []
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            for commit in commits:
-                all_commits.append({
-                    **commit,
-                    'repo': analyzer['name']
-                })
+        all_commits = self._get_all_commits()
 
         # 1. 工作模式分析
         lines.append("### 1️⃣ 工作时间分布")
         lines.append("")
 
         # 统计每个时段的提交
-        time_slots = defaultdict(int)
+        slot_counts = [0] * len(TIME_SLOTS)
         weekday_commits = 0
         weekend_commits = 0
-        late_night_commits = 0
 
         for commit in all_commits:
-            try:
-                dt = parse_iso_datetime(commit['date'])
-                hour = dt.hour
-
-                # 时段分类
-                if 0 <= hour < 6:
-                    time_slots['00-06'] += 1
-                    late_night_commits += 1
-                elif 6 <= hour < 9:
-                    time_slots['06-09'] += 1
-                elif 9 <= hour < 12:
-                    time_slots['09-12'] += 1
-                elif 12 <= hour < 14:
-                    time_slots['12-14'] += 1
-                elif 14 <= hour < 18:
-                    time_slots['14-18'] += 1
-                elif 18 <= hour < 22:
-                    time_slots['18-22'] += 1
-                else:
-                    time_slots['22-24'] += 1
-                    late_night_commits += 1
-
-                # 工作日 vs 周末
-                if is_weekend(commit['date']):
-                    weekend_commits += 1
-                else:
-                    weekday_commits += 1
-            except:
-                pass
+            dt = commit['_dt']
+            if dt is None:
+                continue
+
+            # 时段分类（查表代替逐段比较）
+            slot_counts[SLOT_OF_HOUR[dt.hour]] += 1
+
+            # 工作日 vs 周末
+            if dt.weekday() >= 5:  # 5=周六, 6=周日
+                weekend_commits += 1
+            else:
+                weekday_commits += 1
 
         total_commits = len(all_commits)
+        # 深夜 = 00-06 与 22-24 两个时段
+        late_night_commits = slot_counts[0] + slot_counts[-1]
 
         lines.append("**时段分布热力图** (本周):")
         lines.append("```")
-        for slot in ['00-06', '06-09', '09-12', '12-14', '14-18', '18-22', '22-24']:
-            count = time_slots.get(slot, 0)
+        for slot, count in zip(TIME_SLOTS, slot_counts):
             percentage = (count / total_commits * 100) if total_commits > 0 else 0
             bar_length = int(percentage / 3)
             bar = '█' * bar_length + '░' * (33 - bar_length)
@@ -511,9 +546,7 @@ class WeeklyReportGenerator:
         lines.append("### 2️⃣ 提交节奏分析")
         lines.append("")
 
-        author_commit_counts = defaultdict(int)
-        for commit in all_commits:
-            author_commit_counts[commit['author']] += 1
+        author_commit_counts = Counter(commit['author'] for commit in all_commits)
 
         lines.append("| 开发者 | 提交次数 | 节奏评价 |")
         lines.append("|--------|---------|----------|")
@@ -544,17 +577,13 @@ class WeeklyReportGenerator:
             for file_info in commit['files']:
                 file_authors[file_info['path']].add(commit['author'])
 
-        # 统计协作关系（共同修改文件数）
+        # 统计协作关系（共同修改文件数），每对开发者按排序后的元组只记一次
         authors = list(author_commit_counts.keys())
-        collaboration = defaultdict(lambda: defaultdict(int))
+        collaboration = Counter()
 
-        for filepath, author_set in file_authors.items():
+        for author_set in file_authors.values():
             if len(author_set) > 1:
-                author_list = list(author_set)
-                for i, a1 in enumerate(author_list):
-                    for a2 in author_list[i+1:]:
-                        collaboration[a1][a2] += 1
-                        collaboration[a2][a1] += 1
+                collaboration.update(combinations(sorted(author_set), 2))
 
         if collaboration:
             lines.append("**协作热力图** (共同修改文件数):")
@@ -578,7 +607,7 @@ class WeeklyReportGenerator:
                     if a1 == a2:
                         row += " - |"
                     else:
-                        count = collaboration[a1].get(a2, 0)
+                        count = collaboration[(a1, a2) if a1 < a2 else (a2, a1)]
                         if count > 10:
                             row += f" **{count}** |"
                         elif count > 5:
@@ -591,17 +620,9 @@ class WeeklyReportGenerator:
             lines.append("**分析**:")
 
             # 找出协作最密切的pair
-            max_collab = 0
-            max_pair = None
-            for a1 in collaboration:
-                for a2, count in collaboration[a1].items():
-                    if count > max_collab:
-                        max_collab = count
-                        max_pair = (a1, a2)
-
-            if max_pair:
-                lines.append(f"- **最密切协作**: {max_pair[0]} & {max_pair[1]} (共同修改 {max_collab} 个文件)")
-                lines.append(f"- **建议**: 定期同步沟通，建立代码规范，避免代码冲突")
+            max_pair, max_collab = collaboration.most_common(1)[0]
+            lines.append(f"- **最密切协作**: {max_pair[0]} & {max_pair[1]} (共同修改 {max_collab} 个文件)")
+            lines.append(f"- **建议**: 定期同步沟通，建立代码规范，避免代码冲突")
         else:
             lines.append("本周无明显协作关系（开发者独立工作）")
 
@@ -622,9 +643,9 @@ class WeeklyReportGenerator:
         total_rework = 0
         total_added = 0
 
-        for analyzer in self.analyzers:
-            churn_files, churn_rate = analyzer['churn'].analyze()
-            rework_lines, added_lines, rework_rate = analyzer['rework'].analyze()
+        for analysis in self._get_analyses():
+            churn_files, churn_rate = analysis['churn']
+            rework_lines, added_lines, rework_rate = analysis['rework']
 
             total_churn_rate += churn_rate
             total_rework_rate += rework_rate
@@ -683,20 +704,8 @@ class WeeklyReportGenerator:
         lines.append("### 3️⃣ 提交质量")
         lines.append("")
 
-        all_commits = []
-        large_commits = 0
-        tiny_commits = 0
-
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            all_commits.extend(commits)
-
-            for commit in commits:
-                total_change = commit['lines_added'] + commit['lines_deleted']
-                if total_change > self.config['thresholds']['large_commit']:
-                    large_commits += 1
-                elif total_change < self.config['thresholds']['tiny_commit']:
-                    tiny_commits += 1
+        all_commits = self._get_all_commits()
+        large_commits, tiny_commits = self._get_commit_size_counts()
 
         message_quality = calculate_message_quality(all_commits)
 
@@ -715,10 +724,7 @@ class WeeklyReportGenerator:
         lines.append("")
 
         # 统计高危文件数量
-        high_risk_count = 0
-        for analyzer in self.analyzers:
-            hotspots = analyzer['hotspot'].analyze()
-            high_risk_count += len([h for h in hotspots if h['risk_score'] >= 60])
+        high_risk_count = sum(1 for h in self._get_all_hotspots() if h['risk_score'] >= 60)
 
         lines.append("| 指标 | 数值 | 趋势 |")
         lines.append("|------|------|------|")
@@ -740,27 +746,20 @@ class WeeklyReportGenerator:
         lines = []
 
         # 收集数据用于生成建议
-        all_commits = []
-        all_hotspots = []
-
-        for analyzer in self.analyzers:
-            commits = analyzer['git'].get_commits(self.since_time, self.until_time)
-            all_commits.extend(commits)
-
-            hotspots = analyzer['hotspot'].analyze()
-            all_hotspots.extend([{**h, 'repo': analyzer['name']} for h in hotspots])
+        all_commits = self._get_all_commits()
+        all_hotspots = self._get_all_hotspots()
 
         # 统计指标
         critical_files = [h for h in all_hotspots if h['risk_score'] >= 80]
         high_files = [h for h in all_hotspots if 60 <= h['risk_score'] < 80]
 
-        large_commits = sum(1 for c in all_commits
-                           if c['lines_added'] + c['lines_deleted'] > self.config['thresholds']['large_commit'])
+        large_commits, _ = self._get_commit_size_counts()
 
         message_quality = calculate_message_quality(all_commits)
 
-        late_night = sum(1 for c in all_commits if is_late_night(c['date'], self.config))
-        weekend = sum(1 for c in all_commits if is_weekend(c['date']))
+        off_hours = count_off_hours((c['date'] for c in all_commits), self.working_hours)
+        late_night = off_hours['late_night']
+        weekend = off_hours['weekend']
 
         # 1. 即时行动项
         lines.append("### 1️⃣ 即时行动项（本周完成）")
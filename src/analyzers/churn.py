@@ -55,23 +55,28 @@ class ChurnAnalyzer:
 
         # 获取时间范围内修改的所有文件
         files = self.git_analyzer.get_all_modified_files(since)
+        histories = self.git_analyzer.get_file_histories_bulk(since)
 
         churn_files = []
         for filepath in files:
-            history = self.git_analyzer.get_file_history(filepath, since)
+            history = histories.get(filepath, [])
             modify_count = len(history)
 
             if modify_count >= self.churn_count:
-                authors = self.git_analyzer.get_file_authors(filepath, since)
-                file_size = self.git_analyzer.get_file_size(filepath)
+                authors = self.git_analyzer.get_file_authors(filepath, history=history)
 
                 churn_files.append({
                     'file': filepath,
                     'count': modify_count,
                     'authors': list(authors),
-                    'size': file_size
+                    'size': 0
                 })
 
+        # 批量获取震荡文件的行数
+        sizes = self.git_analyzer.get_file_sizes([f['file'] for f in churn_files])
+        for item in churn_files:
+            item['size'] = sizes[item['file']]
+
         # 计算震荡率
         total_files = len(files) if files else 1
         churn_rate = (len(churn_files) / total_files) * 100
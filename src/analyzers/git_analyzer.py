@@ -3,6 +3,7 @@ Git 分析器
 基于 Provider 模式，兼容多种 Git 平台
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Set
 from datetime import datetime
 
@@ -31,6 +32,8 @@ class GitAnalyzer:
         self.provider = provider
         self.repo_id = repo_id
         self.repo_name = repo_id  # 兼容旧接口
+        # 提交记录缓存：多个分析器使用相同时间窗口时只请求一次 Provider
+        self._commits_cache: Dict[tuple, List[CommitInfo]] = {}
 
     def get_commits(
         self,
@@ -47,9 +50,12 @@ class GitAnalyzer:
             branch: 分支名称，"all" 表示所有分支
 
         Returns:
-            提交信息列表
+            提交信息列表（同一实例内按参数缓存，调用方不应修改）
         """
-        return self.provider.get_commits(self.repo_id, since, until, branch)
+        key = (since, until, branch)
+        if key not in self._commits_cache:
+            self._commits_cache[key] = self.provider.get_commits(self.repo_id, since, until, branch)
+        return self._commits_cache[key]
 
     def get_commits_as_dict(
         self,
@@ -91,6 +97,29 @@ class GitAnalyzer:
             for c in commits
         ]
 
+    def get_file_histories_bulk(self, since: str = "7 days ago") -> Dict[str, List[Dict]]:
+        """
+        批量获取时间范围内所有文件的修改历史
+
+        只获取一次提交记录并按文件分组，结果与逐个调用 get_file_history 一致
+
+        Args:
+            since: 开始时间
+
+        Returns:
+            {文件路径: 修改历史列表}
+        """
+        histories: Dict[str, List[Dict]] = {}
+        for c in self.get_commits(since):
+            entry = {
+                'hash': c.hash,
+                'author': c.author,
+                'date': c.date
+            }
+            for path in {f.path for f in c.files}:
+                histories.setdefault(path, []).append(entry)
+        return histories
+
     def get_all_modified_files(self, since: str = "1 day ago") -> List[str]:
         """
         获取所有修改过的文件
@@ -102,11 +131,8 @@ class GitAnalyzer:
             文件路径列表
         """
         commits = self.get_commits(since)
-        files = set()
-        for commit in commits:
-            for f in commit.files:
-                files.add(f.path)
-        return list(files)
+        # dict.fromkeys 去重并保留首次出现顺序，结果顺序稳定
+        return list(dict.fromkeys(f.path for commit in commits for f in commit.files))
 
     def get_file_size(self, filepath: str) -> int:
         """
@@ -120,18 +146,37 @@ class GitAnalyzer:
         """
         return self.provider.get_file_line_count(self.repo_id, filepath)
 
-    def get_file_authors(self, filepath: str, since: str = "7 days ago") -> Set[str]:
+    def get_file_sizes(self, filepaths: List[str]) -> Dict[str, int]:
+        """
+        批量获取文件行数
+
+        Args:
+            filepaths: 文件路径列表
+
+        Returns:
+            {文件路径: 行数}
+        """
+        return self.provider.get_file_line_counts(self.repo_id, filepaths)
+
+    def get_file_authors(
+        self,
+        filepath: str,
+        since: str = "7 days ago",
+        history: Optional[List[Dict]] = None
+    ) -> Set[str]:
         """
         获取文件的作者列表
 
         Args:
             filepath: 文件路径
             since: 开始时间
+            history: 已获取的修改历史（传入时不再重复查询）
 
         Returns:
             作者集合
         """
-        history = self.get_file_history(filepath, since)
+        if history is None:
+            history = self.get_file_history(filepath, since)
         return set(h['author'] for h in history)
 
 
@@ -168,6 +213,9 @@ class MultiRepoAnalyzer:
         """
         分析所有仓库
 
+        各仓库相互独立，按 provider.max_workers 并发获取
+        （耗时在克隆/git 子进程/API 请求等待上，线程即可）
+
         Args:
             since: 开始时间
             until: 结束时间
@@ -175,8 +223,14 @@ class MultiRepoAnalyzer:
         Returns:
             {repo_id: [commits]}
         """
-        results = {}
-        for repo_id in self.get_all_repos():
-            analyzer = self.get_analyzer(repo_id)
-            results[repo_id] = analyzer.get_commits(since, until)
-        return results
+        repo_ids = self.get_all_repos()
+        if not repo_ids:
+            return {}
+
+        max_workers = min(len(repo_ids), self.provider.max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            commits = executor.map(
+                lambda repo_id: self.get_analyzer(repo_id).get_commits(since, until),
+                repo_ids
+            )
+            return dict(zip(repo_ids, commits))
@@ -30,6 +30,12 @@ class HotspotAnalyzer:
         self.git_analyzer = git_analyzer
         self.config = config
 
+        # 预先拆分排除规则，避免每个文件重复解析
+        exclude_patterns = config.get('exclude_patterns', [])
+        self._exclude_dirs = tuple(config.get('exclude_dirs', []))
+        self._exclude_exts = tuple(p[1:] for p in exclude_patterns if p.startswith('*.'))
+        self._exclude_subs = tuple(p for p in exclude_patterns if not p.startswith('*.'))
+
     def analyze(self, days: int = None) -> List[Dict]:
         """
         分析高危文件
@@ -55,17 +61,23 @@ class HotspotAnalyzer:
 
         since = f"{days} days ago"
         files = self.git_analyzer.get_all_modified_files(since)
+        # 跳过排除的文件
+        files = [f for f in files if not self._should_exclude(f)]
+        histories = self.git_analyzer.get_file_histories_bulk(since)
 
-        hotspots = []
+        # 修改次数和作者数只依赖已获取的历史；按文件大小满分估算上限，
+        # 仍不超过阈值的文件无需读取行数
+        candidates = []
         for filepath in files:
-            # 跳过排除的文件
-            if self._should_exclude(filepath):
-                continue
+            history = histories.get(filepath, [])
+            authors = self.git_analyzer.get_file_authors(filepath, history=history)
+            if self._calculate_risk_score(len(history), 1000, len(authors)) > 40:
+                candidates.append((filepath, len(history), authors))
+        sizes = self.git_analyzer.get_file_sizes([c[0] for c in candidates])
 
-            history = self.git_analyzer.get_file_history(filepath, since)
-            modify_count = len(history)
-            file_size = self.git_analyzer.get_file_size(filepath)
-            authors = self.git_analyzer.get_file_authors(filepath, since)
+        hotspots = []
+        for filepath, modify_count, authors in candidates:
+            file_size = sizes[filepath]
 
             # 计算风险分数
             risk_score = self._calculate_risk_score(modify_count, file_size, len(authors))
@@ -208,24 +220,13 @@ class HotspotAnalyzer:
         Returns:
             是否排除
         """
-        exclude_patterns = self.config.get('exclude_patterns', [])
-        exclude_dirs = self.config.get('exclude_dirs', [])
-
         # 检查目录
-        for dir_pattern in exclude_dirs:
-            if dir_pattern in filepath:
-                return True
-
-        # 检查文件模式
-        for pattern in exclude_patterns:
-            if pattern.startswith('*.'):
-                ext = pattern[1:]
-                if filepath.endswith(ext):
-                    return True
-            elif pattern in filepath:
-                return True
-
-        return False
+        if any(d in filepath for d in self._exclude_dirs):
+            return True
+
+        # 检查文件模式：扩展名一次 endswith 判断，其余按子串匹配
+        return (filepath.endswith(self._exclude_exts)
+                or any(p in filepath for p in self._exclude_subs))
 
     def get_summary(self, days: int = None) -> Dict:
         """
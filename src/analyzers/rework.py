@@ -4,7 +4,9 @@
 """
 
 from typing import List, Dict, Tuple
+from bisect import bisect_left
 from collections import defaultdict
+from datetime import datetime, timedelta
 
 from .git_analyzer import GitAnalyzer
 from ..utils.helpers import parse_iso_datetime
@@ -39,6 +41,10 @@ class ReworkAnalyzer:
         self.add_days = add_days
         self.delete_days = delete_days
 
+    def _delete_window(self) -> timedelta:
+        """删除检测窗口：间隔不足 M+1 天（即 .days <= M）的后续变更都在窗口内"""
+        return timedelta(days=self.delete_days + 1)
+
     def analyze(self) -> Tuple[int, int, float]:
         """
         分析返工率
@@ -49,8 +55,8 @@ class ReworkAnalyzer:
         since = f"{self.add_days} days ago"
         commits = self.git_analyzer.get_commits(since)
 
-        # 统计每个文件的变更历史
-        file_changes: Dict[str, List[Dict]] = defaultdict(list)
+        # 统计每个文件的变更历史，每次变更记为 (日期, 新增, 删除) 元组
+        file_changes: Dict[str, List[Tuple[datetime, int, int]]] = defaultdict(list)
 
         for commit in commits:
             try:
@@ -59,30 +65,34 @@ class ReworkAnalyzer:
                 continue
 
             for file_change in commit.files:
-                file_changes[file_change.path].append({
-                    'date': commit_date,
-                    'added': file_change.added,
-                    'deleted': file_change.deleted
-                })
+                file_changes[file_change.path].append(
+                    (commit_date, file_change.added, file_change.deleted)
+                )
 
         # 检测返工：N天内新增，M天内被删除
         rework_lines = 0
         total_added = 0
+        window = self._delete_window()
+
+        for changes in file_changes.values():
+            if len(changes) == 1:
+                total_added += changes[0][1]
+                continue
 
-        for filepath, changes in file_changes.items():
             # 按时间排序
-            changes.sort(key=lambda x: x['date'])
+            changes.sort(key=lambda x: x[0])
+            dates = [c[0] for c in changes]
+            deleted = [c[2] for c in changes]
 
-            for i, change in enumerate(changes):
-                total_added += change['added']
+            for i, (date, added, _) in enumerate(changes):
+                total_added += added
+                if not added:
+                    continue
 
-                # 检查这次新增是否在后续几天内被删除
-                for j in range(i + 1, len(changes)):
-                    days_diff = (changes[j]['date'] - change['date']).days
-                    if days_diff <= self.delete_days:
-                        # 简化计算：如果后续有删除，认为是部分返工
-                        estimated_rework = min(change['added'], changes[j]['deleted'])
-                        rework_lines += estimated_rework
+                # 已按时间排序，二分查找窗口右边界，窗口内的后续删除计为返工
+                end = bisect_left(dates, date + window, i + 1)
+                # 简化计算：如果后续有删除，认为是部分返工
+                rework_lines += sum([d if d < added else added for d in deleted[i + 1:end]])
 
         # 计算返工率
         rework_rate = (rework_lines / total_added * 100) if total_added > 0 else 0
@@ -137,8 +147,8 @@ class ReworkAnalyzer:
         # 按作者统计
         author_stats: Dict[str, Dict] = defaultdict(lambda: {'added': 0, 'rework': 0})
 
-        # 按文件跟踪变更
-        file_changes: Dict[str, List[Dict]] = defaultdict(list)
+        # 按文件跟踪变更，每次变更记为 (日期, 作者, 新增, 删除) 元组
+        file_changes: Dict[str, List[Tuple[datetime, str, int, int]]] = defaultdict(list)
 
         for commit in commits:
             try:
@@ -151,23 +161,27 @@ class ReworkAnalyzer:
             for file_change in commit.files:
                 author_stats[author]['added'] += file_change.added
 
-                file_changes[file_change.path].append({
-                    'date': commit_date,
-                    'author': author,
-                    'added': file_change.added,
-                    'deleted': file_change.deleted
-                })
+                file_changes[file_change.path].append(
+                    (commit_date, author, file_change.added, file_change.deleted)
+                )
 
         # 计算每个作者的返工
-        for filepath, changes in file_changes.items():
-            changes.sort(key=lambda x: x['date'])
-
-            for i, change in enumerate(changes):
-                for j in range(i + 1, len(changes)):
-                    days_diff = (changes[j]['date'] - change['date']).days
-                    if days_diff <= self.delete_days:
-                        estimated_rework = min(change['added'], changes[j]['deleted'])
-                        author_stats[change['author']]['rework'] += estimated_rework
+        window = self._delete_window()
+        for changes in file_changes.values():
+            if len(changes) == 1:
+                continue
+
+            changes.sort(key=lambda x: x[0])
+            dates = [c[0] for c in changes]
+            deleted = [c[3] for c in changes]
+
+            for i, (date, author, added, _) in enumerate(changes):
+                if not added:
+                    continue
+                end = bisect_left(dates, date + window, i + 1)
+                author_stats[author]['rework'] += sum(
+                    [d if d < added else added for d in deleted[i + 1:end]]
+                )
 
         # 计算返工率
         result = {}
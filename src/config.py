@@ -10,6 +10,11 @@ from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # 未编译 libyaml 时退回纯 Python 解析器
+    from yaml import SafeLoader as YamlLoader
+
 
 # 默认配置
 DEFAULT_CONFIG = {
@@ -214,7 +219,7 @@ def load_config(config_path: Optional[str] = None, use_env: bool = True) -> Dict
 
     if config_path and os.path.exists(config_path):
         with open(config_path, 'r', encoding='utf-8') as f:
-            yaml_config = yaml.safe_load(f) or {}
+            yaml_config = yaml.load(f, Loader=YamlLoader) or {}
             yaml_config = _process_config_values(yaml_config)
             config = _deep_merge(config, yaml_config)
 
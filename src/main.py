@@ -20,6 +20,7 @@ from .providers.generic_git import GenericGitProvider
 from .providers.github import GitHubProvider
 from .providers.gitlab import GitLabProvider
 from .providers.codeup import CodeupProvider
+from .providers.cache import CachedProvider
 from .reporters import DailyReporter, WeeklyReporter, MonthlyReporter
 from .notifiers import DingtalkNotifier, FeishuNotifier
 from .utils.html_generator import convert_md_to_html, convert_all_reports
@@ -31,12 +32,23 @@ def create_provider(config: Config):
     """
     根据配置创建 Git Provider
 
+    配置了 analysis.cache_dir 时，已结束时间窗口的提交记录会缓存到该目录
+
     Args:
         config: 配置对象
 
     Returns:
         GitProvider 实例
     """
+    provider = _create_platform_provider(config)
+    cache_dir = config.get('analysis.cache_dir', '')
+    if provider and cache_dir:
+        provider = CachedProvider(provider, cache_dir)
+    return provider
+
+
+def _create_platform_provider(config: Config):
+    """根据 git.platform 创建对应平台的 Provider"""
     platform = config.git_platform.lower()
 
     # GitHub API Provider
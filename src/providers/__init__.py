@@ -8,6 +8,7 @@ from .generic_git import GenericGitProvider
 from .github import GitHubProvider
 from .gitlab import GitLabProvider
 from .codeup import CodeupProvider
+from .cache import CachedProvider
 
 __all__ = [
     'GitProvider',
@@ -18,4 +19,5 @@ __all__ = [
     'GitHubProvider',
     'GitLabProvider',
     'CodeupProvider',
+    'CachedProvider',
 ]
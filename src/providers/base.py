@@ -4,6 +4,7 @@ Git Provider 抽象基类
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -106,6 +107,9 @@ class GitProvider(ABC):
     所有 Git 平台（GitHub、GitLab、Codeup、通用Git）都需要实现这个接口
     """
 
+    # 默认批量实现中并发请求单个文件的线程数（API 请求以网络等待为主）
+    max_workers: int = 8
+
     @abstractmethod
     def get_commits(
         self,
@@ -180,6 +184,39 @@ class GitProvider(ABC):
             return 0
         return len(content.splitlines())
 
+    def get_file_line_counts(
+        self,
+        repo_id: str,
+        filepaths: List[str],
+        ref: str = "HEAD"
+    ) -> Dict[str, int]:
+        """
+        批量获取文件行数
+
+        默认实现：以 max_workers 个线程并发调用 get_file_line_count
+        子类可以覆盖此方法以提供更高效的实现
+
+        Args:
+            repo_id: 仓库标识符
+            filepaths: 文件路径列表
+            ref: Git 引用
+
+        Returns:
+            {文件路径: 行数}，不存在的文件为 0
+        """
+        if len(filepaths) <= 1:
+            return {
+                filepath: self.get_file_line_count(repo_id, filepath, ref)
+                for filepath in filepaths
+            }
+
+        with ThreadPoolExecutor(max_workers=min(len(filepaths), self.max_workers)) as executor:
+            counts = executor.map(
+                lambda filepath: self.get_file_line_count(repo_id, filepath, ref),
+                filepaths
+            )
+            return dict(zip(filepaths, counts))
+
     def get_file_history(
         self,
         repo_id: str,
@@ -0,0 +1,144 @@
+"""
+带磁盘缓存的 Provider 包装器
+为任意 GitProvider 缓存已结束时间窗口的提交记录
+"""
+
+import json
+import os
+from datetime import date, datetime
+from typing import List, Dict, Optional
+from urllib.parse import quote
+
+from .base import GitProvider, CommitInfo, FileChange, RepoInfo
+
+
+class CachedProvider(GitProvider):
+    """
+    磁盘缓存 Provider
+
+    包装另一个 Provider：起止时间均为绝对日期且结束时间已过去的查询，
+    结果不会再变化，写入 JSON 缓存后重复生成周报/月报时直接读取，
+    不再重新克隆或请求 API。相对时间（如 "7 days ago"）和未结束的窗口
+    每次都会转发给被包装的 Provider。
+    """
+
+    def __init__(self, provider: GitProvider, cache_dir: str):
+        """
+        初始化缓存 Provider
+
+        Args:
+            provider: 被包装的 Git 数据提供者
+            cache_dir: 缓存目录
+        """
+        self.provider = provider
+        self.cache_dir = cache_dir
+        self.max_workers = provider.max_workers
+
+    def __getattr__(self, name):
+        # 平台特有的方法（如 Codeup 的 list_branches）直接转发
+        if name == 'provider':
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    @staticmethod
+    def _is_closed_window(since: str, until: Optional[str]) -> bool:
+        """
+        时间窗口是否已结束（起止均为绝对日期，且结束日期早于今天）
+
+        结束日期当天仍不算结束：Codeup 按天比较会包含 until 当天的提交，
+        git 的 --until=YYYY-MM-DD 取当前时刻，都可能在当天继续返回新提交。
+        """
+        if not until:
+            return False
+        try:
+            datetime.fromisoformat(since)
+            return datetime.fromisoformat(until).date() < date.today()
+        except (ValueError, TypeError):  # 相对时间（如 "7 days ago"）
+            return False
+
+    def _cache_path(self, repo_id: str, since: str, until: str, branch: str) -> str:
+        """提交缓存文件路径（repo_id 可能含 /，需转义）"""
+        filename = quote(f"{since}_{until}_{branch}", safe='') + '.json'
+        return os.path.join(self.cache_dir, quote(repo_id, safe=''), filename)
+
+    def get_commits(
+        self,
+        repo_id: str,
+        since: str,
+        until: Optional[str] = None,
+        branch: str = "all"
+    ) -> List[CommitInfo]:
+        """获取提交记录（已结束的时间窗口优先读取缓存）"""
+        if not self._is_closed_window(since, until):
+            return self.provider.get_commits(repo_id, since, until, branch)
+
+        cache_path = self._cache_path(repo_id, since, until, branch)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return [
+                    CommitInfo(
+                        hash=c['hash'],
+                        author=c['author'],
+                        email=c['email'],
+                        date=c['date'],
+                        message=c['message'],
+                        files=[FileChange(**fc) for fc in c['files']],
+                    )
+                    for c in json.load(f)
+                ]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        commits = self.provider.get_commits(repo_id, since, until, branch)
+
+        # 空结果可能是请求失败，不写入缓存
+        if commits:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump([c.to_dict() for c in commits], f, ensure_ascii=False)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"⚠️  {repo_id}: 写入提交缓存失败: {e}")
+
+        return commits
+
+    def list_repositories(self) -> List[RepoInfo]:
+        return self.provider.list_repositories()
+
+    def get_file_content(
+        self,
+        repo_id: str,
+        filepath: str,
+        ref: str = "HEAD"
+    ) -> Optional[str]:
+        return self.provider.get_file_content(repo_id, filepath, ref)
+
+    def get_file_line_count(
+        self,
+        repo_id: str,
+        filepath: str,
+        ref: str = "HEAD"
+    ) -> int:
+        return self.provider.get_file_line_count(repo_id, filepath, ref)
+
+    def get_file_line_counts(
+        self,
+        repo_id: str,
+        filepaths: List[str],
+        ref: str = "HEAD"
+    ) -> Dict[str, int]:
+        return self.provider.get_file_line_counts(repo_id, filepaths, ref)
+
+    def get_file_history(
+        self,
+        repo_id: str,
+        filepath: str,
+        since: str,
+        until: Optional[str] = None
+    ) -> List[CommitInfo]:
+        return self.provider.get_file_history(repo_id, filepath, since, until)
+
+    def cleanup(self) -> None:
+        self.provider.cleanup()
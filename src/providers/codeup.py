@@ -390,15 +390,18 @@ class CodeupProvider(GitProvider):
                 break
 
             for item in commits_list:
+                # 先用列表中的日期检查时间范围，窗口外的提交不再请求详情
+                commit_date = self._parse_date(
+                    item.get('authoredDate', item.get('committedDate', ''))
+                )[:10]
+                if since and commit_date < since[:10]:
+                    # 已经超出时间范围，停止获取
+                    return all_commits
+                if until and commit_date > until[:10]:
+                    continue
+
                 commit = self._parse_commit(item, repo_id)
                 if commit:
-                    # 检查时间范围
-                    commit_date = commit.date[:10]
-                    if since and commit_date < since[:10]:
-                        # 已经超出时间范围，停止获取
-                        return all_commits
-                    if until and commit_date > until[:10]:
-                        continue
                     all_commits.append(commit)
 
             if len(commits_list) < 100:
@@ -166,10 +166,12 @@ class GenericGitProvider(GitProvider):
             命令输出
         """
         cmd = ['git', '-C', repo_path] + args
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True)
         if result.returncode != 0:
-            raise RuntimeError(f"Git 命令失败: {' '.join(cmd)}\n{result.stderr}")
-        return result.stdout
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            raise RuntimeError(f"Git 命令失败: {' '.join(cmd)}\n{stderr}")
+        # 固定按 UTF-8 解码，不依赖运行环境的 locale
+        return result.stdout.decode('utf-8', errors='replace')
 
     def _parse_git_log(self, output: str) -> List[CommitInfo]:
         """
@@ -330,6 +332,59 @@ class GenericGitProvider(GitProvider):
         except RuntimeError:
             return None
 
+    def get_file_line_counts(
+        self,
+        repo_id: str,
+        filepaths: List[str],
+        ref: str = "HEAD"
+    ) -> Dict[str, int]:
+        """
+        批量获取文件行数
+
+        通过一个 git cat-file --batch 进程读取所有文件，避免逐个执行 git show
+
+        Args:
+            repo_id: 仓库名称
+            filepaths: 文件路径列表
+            ref: Git 引用
+
+        Returns:
+            {文件路径: 行数}，不存在的文件为 0
+        """
+        counts = {filepath: 0 for filepath in filepaths}
+        # 含换行的路径无法通过 --batch 的逐行协议传递，按不存在处理
+        queried = [p for p in counts if '\n' not in p]
+        if not queried:
+            return counts
+
+        repo_path = self._clone_repo(repo_id)
+        request = ''.join(f'{ref}:{p}\n' for p in queried).encode('utf-8')
+        result = subprocess.run(
+            ['git', '-C', repo_path, 'cat-file', '--batch'],
+            input=request,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Git 命令失败: git cat-file --batch\n{result.stderr.decode('utf-8', 'replace')}")
+
+        # 输出格式: "<sha> <type> <size>\n<content>\n"，不存在时为 "<object> missing\n"
+        output = result.stdout
+        pos = 0
+        for filepath in queried:
+            end = output.index(b'\n', pos)
+            header = output[pos:end].split(b' ')
+            pos = end + 1
+            if not header[-1].isdigit():
+                # missing / ambiguous，没有内容段
+                continue
+            size = int(header[-1])
+            if header[1] == b'blob':
+                content = output[pos:pos + size].decode('utf-8', 'replace')
+                counts[filepath] = len(content.splitlines())
+            pos += size + 1
+
+        return counts
+
     def get_modified_files(
         self,
         repo_id: str,
@@ -3,6 +3,7 @@
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -17,10 +18,9 @@ from ..analyzers import (
     calculate_large_commits,
 )
 from ..utils.helpers import (
+    WorkingHours,
+    count_off_hours,
     format_number,
-    is_late_night,
-    is_weekend,
-    is_overtime,
     calculate_message_quality,
     parse_iso_datetime,
 )
@@ -67,25 +67,34 @@ class BaseReporter(ABC):
         """
         all_commits = []
         repos = self.provider.list_repositories()
+        if not repos:
+            return all_commits
 
-        for repo in repos:
+        def fetch(repo):
             try:
-                commits = self.provider.get_commits(repo.id, since, until)
-                for commit in commits:
-                    all_commits.append({
-                        'hash': commit.hash,
-                        'author': commit.author,
-                        'email': commit.email,
-                        'date': commit.date,
-                        'message': commit.message,
-                        'files': [{'path': f.path, 'added': f.added, 'deleted': f.deleted} for f in commit.files],
-                        'lines_added': commit.lines_added,
-                        'lines_deleted': commit.lines_deleted,
-                        'repo': repo.name,
-                        'repo_type': repo.type,
-                    })
+                return self.provider.get_commits(repo.id, since, until)
             except Exception as e:
                 print(f"  ⚠️  获取 {repo.name} 提交失败: {e}")
+                return []
+
+        # 各仓库并发获取，按仓库顺序合并结果
+        with ThreadPoolExecutor(max_workers=min(len(repos), self.provider.max_workers)) as executor:
+            repo_commits = list(executor.map(fetch, repos))
+
+        for repo, commits in zip(repos, repo_commits):
+            for commit in commits:
+                all_commits.append({
+                    'hash': commit.hash,
+                    'author': commit.author,
+                    'email': commit.email,
+                    'date': commit.date,
+                    'message': commit.message,
+                    'files': [{'path': f.path, 'added': f.added, 'deleted': f.deleted} for f in commit.files],
+                    'lines_added': commit.lines_added,
+                    'lines_deleted': commit.lines_deleted,
+                    'repo': repo.name,
+                    'repo_type': repo.type,
+                })
 
         return all_commits
 
@@ -133,16 +142,11 @@ class BaseReporter(ABC):
         result['message_quality'] = calculate_message_quality(commits)
 
         # 计算异常工作时间提交
-        config_dict = self.config.to_dict()
-        result['late_night_commits'] = sum(
-            1 for c in commits if is_late_night(c.date, config_dict)
-        )
-        result['weekend_commits'] = sum(
-            1 for c in commits if is_weekend(c.date)
-        )
-        result['overtime_commits'] = sum(
-            1 for c in commits if is_overtime(c.date, config_dict)
-        )
+        working_hours = WorkingHours(self.config.to_dict())
+        off_hours = count_off_hours((c.date for c in commits), working_hours)
+        result['late_night_commits'] = off_hours['late_night']
+        result['weekend_commits'] = off_hours['weekend']
+        result['overtime_commits'] = off_hours['overtime']
 
         # 详细分析
         if detailed:
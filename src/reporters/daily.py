@@ -10,6 +10,8 @@ from .base import BaseReporter
 from ..providers.base import GitProvider
 from ..config import Config
 from ..utils.helpers import (
+    WorkingHours,
+    count_off_hours,
     format_number,
     is_late_night,
     is_weekend,
@@ -291,15 +293,15 @@ class DailyReporter(BaseReporter):
     def _generate_risk_alerts(self, all_commits: list) -> str:
         """生成风险预警"""
         lines = []
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         # 1. 工作时间异常
         lines.append("### ⏰ 工作时间分析")
         lines.append("")
 
-        late_night = [c for c in all_commits if is_late_night(c['date'], config_dict)]
+        late_night = [c for c in all_commits if is_late_night(c['date'], working_hours)]
         weekend = [c for c in all_commits if is_weekend(c['date'])]
-        overtime = [c for c in all_commits if is_overtime(c['date'], config_dict)]
+        overtime = [c for c in all_commits if is_overtime(c['date'], working_hours)]
 
         if late_night or weekend or overtime:
             lines.append("| 类型 | 数量 | 说明 |")
@@ -360,7 +362,7 @@ class DailyReporter(BaseReporter):
 
     def _generate_health_score(self, all_commits: list) -> str:
         """生成健康评分"""
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         # 收集指标
         large_threshold = self.thresholds.get('large_commit', 500)
@@ -369,8 +371,9 @@ class DailyReporter(BaseReporter):
             if c['lines_added'] + c['lines_deleted'] > large_threshold
         )
 
-        late_night = sum(1 for c in all_commits if is_late_night(c['date'], config_dict))
-        weekend = sum(1 for c in all_commits if is_weekend(c['date']))
+        off_hours = count_off_hours((c['date'] for c in all_commits), working_hours)
+        late_night = off_hours['late_night']
+        weekend = off_hours['weekend']
         message_quality = calculate_message_quality(all_commits)
 
         # 简化评分
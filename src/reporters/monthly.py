@@ -11,6 +11,8 @@ from .base import BaseReporter
 from ..providers.base import GitProvider
 from ..config import Config
 from ..utils.helpers import (
+    WorkingHours,
+    count_off_hours,
     format_number,
     is_late_night,
     is_weekend,
@@ -283,7 +285,7 @@ class MonthlyReporter(BaseReporter):
     def _generate_health_metrics(self, all_commits: list) -> str:
         """生成健康指标"""
         lines = []
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         if not all_commits:
             lines.append("本月无提交数据")
@@ -300,7 +302,7 @@ class MonthlyReporter(BaseReporter):
                 commit_dt = parse_iso_datetime(c['date'])
                 if is_weekend(c['date']):
                     weekend_hours += 1
-                elif is_late_night(c['date'], config_dict):
+                elif is_late_night(c['date'], working_hours):
                     late_night_hours += 1
                 elif commit_dt.hour >= 18:
                     overtime_hours += 1
@@ -387,15 +389,16 @@ class MonthlyReporter(BaseReporter):
     def _generate_recommendations(self, all_commits: list) -> str:
         """生成下月计划建议"""
         lines = []
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         if not all_commits:
             lines.append("基于本月数据不足，无法生成建议")
             return '\n'.join(lines)
 
         total = len(all_commits)
-        late_night = len([c for c in all_commits if is_late_night(c['date'], config_dict)])
-        weekend = len([c for c in all_commits if is_weekend(c['date'])])
+        off_hours = count_off_hours((c['date'] for c in all_commits), working_hours)
+        late_night = off_hours['late_night']
+        weekend = off_hours['weekend']
         large = len([c for c in all_commits if c['lines_added'] + c['lines_deleted'] > 500])
 
         lines.append("基于本月数据分析，建议下月重点关注：")
@@ -10,8 +10,9 @@ from .base import BaseReporter
 from ..providers.base import GitProvider
 from ..config import Config
 from ..utils.helpers import (
+    WorkingHours,
+    count_off_hours,
     format_number,
-    is_late_night,
     is_weekend,
     calculate_message_quality,
     parse_iso_datetime,
@@ -355,7 +356,7 @@ class WeeklyReporter(BaseReporter):
 
     def _generate_health_score_section(self, all_commits: list) -> str:
         """生成健康评分"""
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         # 收集指标
         large_threshold = self.thresholds.get('large_commit', 500)
@@ -364,8 +365,9 @@ class WeeklyReporter(BaseReporter):
             if c['lines_added'] + c['lines_deleted'] > large_threshold
         )
 
-        late_night = sum(1 for c in all_commits if is_late_night(c['date'], config_dict))
-        weekend = sum(1 for c in all_commits if is_weekend(c['date']))
+        off_hours = count_off_hours((c['date'] for c in all_commits), working_hours)
+        late_night = off_hours['late_night']
+        weekend = off_hours['weekend']
         message_quality = calculate_message_quality(all_commits)
 
         # 计算评分
@@ -415,14 +417,15 @@ class WeeklyReporter(BaseReporter):
     def _generate_recommendations(self, all_commits: list) -> str:
         """生成改进建议"""
         lines = []
-        config_dict = self.config.to_dict()
+        working_hours = WorkingHours(self.config.to_dict())
 
         # 收集数据
         large_threshold = self.thresholds.get('large_commit', 500)
         large_commits = sum(1 for c in all_commits if c['lines_added'] + c['lines_deleted'] > large_threshold)
         message_quality = calculate_message_quality(all_commits)
-        late_night = sum(1 for c in all_commits if is_late_night(c['date'], config_dict))
-        weekend = sum(1 for c in all_commits if is_weekend(c['date']))
+        off_hours = count_off_hours((c['date'] for c in all_commits), working_hours)
+        late_night = off_hours['late_night']
+        weekend = off_hours['weekend']
 
         lines.append("### 🎯 本周行动项")
         lines.append("")
@@ -7,11 +7,13 @@ from .helpers import (
     is_late_night,
     is_weekend,
     is_overtime,
+    WorkingHours,
+    count_off_hours,
     calculate_message_quality,
     format_number,
     get_time_range,
 )
-from .html_generator import convert_md_to_html, convert_all_reports
+from .html_generator import convert_md_to_html, convert_batch, convert_all_reports
 from .index_generator import generate_index
 from .dashboard_generator import generate_dashboard, collect_dashboard_data
 
@@ -20,10 +22,13 @@ __all__ = [
     'is_late_night',
     'is_weekend',
     'is_overtime',
+    'WorkingHours',
+    'count_off_hours',
     'calculate_message_quality',
     'format_number',
     'get_time_range',
     'convert_md_to_html',
+    'convert_batch',
     'convert_all_reports',
     'generate_index',
     'generate_dashboard',
@@ -4,15 +4,25 @@
 
 import re
 from datetime import datetime
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable
 
 
+@lru_cache(maxsize=8192)
 def parse_iso_datetime(date_str: str) -> datetime:
-    """解析ISO格式日期时间字符串"""
+    """解析ISO格式日期时间字符串（同一时间字符串只解析一次）"""
     # 移除时区信息
     date_str = date_str.replace(' +0800', '').replace('+0800', '')
     date_str = date_str.replace(' +0000', '').replace('+0000', '')
 
+    # 快速路径：标准的 YYYY-MM-DD HH:MM:SS / YYYY-MM-DDTHH:MM:SS 交给 C 实现的 fromisoformat
+    head = date_str[:19]
+    if len(head) == 19 and head[10] in ' T':
+        try:
+            return datetime.fromisoformat(head)
+        except ValueError:
+            pass
+
     # 尝试多种格式
     formats = [
         '%Y-%m-%d %H:%M:%S',
@@ -31,20 +41,58 @@ def parse_iso_datetime(date_str: str) -> datetime:
     return datetime.strptime(date_str[:19], '%Y-%m-%d %H:%M:%S')
 
 
-def is_late_night(time_str: str, config: Dict) -> bool:
-    """判断是否深夜提交"""
-    try:
-        time = parse_iso_datetime(time_str)
-        hour = time.hour
+@lru_cache(maxsize=64)
+def _clock_hour(value: str) -> int:
+    """配置中的 HH:MM 时间点取小时（每个取值只解析一次）"""
+    return int(value.split(':')[0])
+
 
+@lru_cache(maxsize=64)
+def _clock_minutes(value: str) -> int:
+    """配置中的 HH:MM 时间点转换为当天分钟数（每个取值只解析一次）"""
+    hour, minute = map(int, value.split(':'))
+    return hour * 60 + minute
+
+
+class WorkingHours:
+    """配置中的深夜/加班时间段，解析一次后逐条提交只做整数比较"""
+
+    def __init__(self, config: Dict):
         working_hours = config.get('working_hours', {})
-        late_start = int(working_hours.get('late_night_start', '22:00').split(':')[0])
-        late_end = int(working_hours.get('late_night_end', '06:00').split(':')[0])
+        try:
+            self.late_start = _clock_hour(working_hours.get('late_night_start', '22:00'))
+            self.late_end = _clock_hour(working_hours.get('late_night_end', '06:00'))
+        except Exception:
+            # 格式错误时不判定为深夜
+            self.late_start = self.late_end = None
+        try:
+            self.overtime_start = _clock_minutes(working_hours.get('overtime_start', '18:00'))
+            self.overtime_end = _clock_minutes(working_hours.get('overtime_end', '21:00'))
+        except Exception:
+            self.overtime_start = self.overtime_end = None
+
+    def is_late_night(self, time: datetime) -> bool:
+        """判断时间是否在深夜时段"""
+        if self.late_start is None:
+            return False
+        hour = time.hour
+        if self.late_start > self.late_end:  # 跨天 (22:00 - 06:00)
+            return hour >= self.late_start or hour < self.late_end
+        return self.late_start <= hour < self.late_end
 
-        if late_start > late_end:  # 跨天 (22:00 - 06:00)
-            return hour >= late_start or hour < late_end
-        else:
-            return late_start <= hour < late_end
+    def is_overtime(self, time: datetime) -> bool:
+        """判断时间是否在加班时段"""
+        if self.overtime_start is None:
+            return False
+        return self.overtime_start <= time.hour * 60 + time.minute < self.overtime_end
+
+
+def is_late_night(time_str: str, config) -> bool:
+    """判断是否深夜提交（逐条判断时 config 传入预先构造的 WorkingHours）"""
+    try:
+        time = parse_iso_datetime(time_str)
+        hours = config if isinstance(config, WorkingHours) else WorkingHours(config)
+        return hours.is_late_night(time)
     except Exception:
         return False
 
@@ -58,27 +106,32 @@ def is_weekend(time_str: str) -> bool:
         return False
 
 
-def is_overtime(time_str: str, config: Dict) -> bool:
-    """判断是否加班时间提交 (18:00-21:00)"""
+def is_overtime(time_str: str, config) -> bool:
+    """判断是否加班时间提交 (18:00-21:00)，config 同 is_late_night"""
     try:
         time = parse_iso_datetime(time_str)
-        hour = time.hour
-        minute = time.minute
+        hours = config if isinstance(config, WorkingHours) else WorkingHours(config)
+        return hours.is_overtime(time)
+    except Exception:
+        return False
 
-        working_hours = config.get('working_hours', {})
-        overtime_start = working_hours.get('overtime_start', '18:00')
-        overtime_end = working_hours.get('overtime_end', '21:00')
 
-        start_hour, start_minute = map(int, overtime_start.split(':'))
-        end_hour, end_minute = map(int, overtime_end.split(':'))
+def count_off_hours(dates: Iterable[str], working_hours: WorkingHours) -> Dict[str, int]:
+    """一次遍历统计深夜/周末/加班提交数（每条提交只解析一次时间）"""
+    late_night = weekend = overtime = 0
+    for date_str in dates:
+        try:
+            time = parse_iso_datetime(date_str)
+        except Exception:
+            continue
+        late_night += working_hours.is_late_night(time)
+        weekend += time.weekday() >= 5
+        overtime += working_hours.is_overtime(time)
+    return {'late_night': late_night, 'weekend': weekend, 'overtime': overtime}
 
-        current_minutes = hour * 60 + minute
-        start_minutes = start_hour * 60 + start_minute
-        end_minutes = end_hour * 60 + end_minute
 
-        return start_minutes <= current_minutes < end_minutes
-    except Exception:
-        return False
+# 规范的提交信息前缀（预编译，避免每条提交重复查找正则缓存）
+_GOOD_PREFIX = re.compile(r'^(feat|fix|refactor|docs|test|chore|style|perf)(\(.+\))?:')
 
 
 def calculate_message_quality(commits: List[Dict]) -> float:
@@ -86,11 +139,6 @@ def calculate_message_quality(commits: List[Dict]) -> float:
     if not commits:
         return 100.0
 
-    good_patterns = [
-        r'^(feat|fix|refactor|docs|test|chore|style|perf)(\(.+\))?:',
-        r'.{10,}',  # 至少10个字符
-    ]
-
     good_count = 0
     for commit in commits:
         # 支持 CommitInfo 对象和 dict
@@ -99,8 +147,9 @@ def calculate_message_quality(commits: List[Dict]) -> float:
         else:
             message = commit.get('message', '')
 
-        is_good = any(re.match(pattern, message) for pattern in good_patterns)
-        if is_good:
+        # 至少10个字符（message 为单行标题），或规范前缀；
+        # 先做长度判断，多数提交无需进入正则引擎
+        if len(message) >= 10 or _GOOD_PREFIX.match(message):
             good_count += 1
 
     return (good_count / len(commits)) * 100
@@ -3,7 +3,10 @@ HTML 生成器 - 将 Markdown 报告转换为美观的 HTML 页面
 移植自 V1 scripts/md2html.py
 """
 
+import os
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -11,43 +14,37 @@ try:
 except ImportError:
     markdown = None
 
+# 需要原样保留的 markdown 片段 (按优先级)：代码块、行内代码、链接
+PROTECTED_RE = re.compile(
+    r'```[\s\S]*?```'
+    r'|`[^`]+`'
+    r'|\[[^\]]+\]\([^)]+\)'
+)
+
+# Markdown 转换器，首次使用时创建，之后所有文件共用 (转换前 reset)
+_md_converter = None
+
+
+def _get_md_converter():
+    """获取共用的 Markdown 转换器实例"""
+    global _md_converter
+    if _md_converter is None:
+        _md_converter = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
+    return _md_converter
 
 def escape_html_in_content(md_content: str) -> str:
     """转义markdown内容中的HTML特殊字符，但保留markdown语法"""
 
-    # 保护代码块
-    code_blocks = []
-    def save_code_block(match):
-        code_blocks.append(match.group(0))
-        return f"___CODE_BLOCK_{len(code_blocks)-1}___"
-    md_content = re.sub(r'```[\s\S]*?```', save_code_block, md_content)
-
-    # 保护行内代码
-    inline_codes = []
-    def save_inline_code(match):
-        inline_codes.append(match.group(0))
-        return f"___INLINE_CODE_{len(inline_codes)-1}___"
-    md_content = re.sub(r'`[^`]+`', save_inline_code, md_content)
-
-    # 保护markdown链接
-    md_links = []
-    def save_md_link(match):
-        md_links.append(match.group(0))
-        return f"___MD_LINK_{len(md_links)-1}___"
-    md_content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', save_md_link, md_content)
-
-    # 转义HTML特殊字符
-    md_content = md_content.replace('<', '&lt;').replace('>', '&gt;')
-
-    # 恢复保护的内容
-    for i, link in enumerate(md_links):
-        md_content = md_content.replace(f"___MD_LINK_{i}___", link)
-    for i, code in enumerate(inline_codes):
-        md_content = md_content.replace(f"___INLINE_CODE_{i}___", code)
-    for i, code in enumerate(code_blocks):
-        md_content = md_content.replace(f"___CODE_BLOCK_{i}___", code)
-
-    return md_content
+    # 一次扫描切分出需要保留的片段，只转义片段之间的普通文本
+    parts = []
+    last = 0
+    for match in PROTECTED_RE.finditer(md_content):
+        parts.append(md_content[last:match.start()].replace('<', '&lt;').replace('>', '&gt;'))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(md_content[last:].replace('<', '&lt;').replace('>', '&gt;'))
+
+    return ''.join(parts)
 
 
 # HTML 模板样式 (V1 风格)
@@ -96,6 +93,69 @@ a:hover { text-decoration: underline; }
 """
 
 
+# HTML 页面模板：标题前后及正文之后的部分，模块加载时构建一次
+HTML_HEAD_START = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>"""
+
+HTML_HEAD_END = """</title>
+    <style>""" + HTML_STYLE + """</style>
+</head>
+<body>
+    <div class="container">
+        """
+
+HTML_TAIL = """
+        <hr>
+        <div class="meta-info">
+            Generated from: {name} | Report generated by Code Health Monitor
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def _render_html(md_path: Path) -> str:
+    """读取 Markdown 文件并渲染为完整的 HTML 页面"""
+    # 读取 Markdown 内容
+    with open(md_path, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+
+    # 转义 HTML 特殊字符
+    md_content = escape_html_in_content(md_content)
+
+    # 转换为 HTML
+    md_converter = _get_md_converter()
+    md_converter.reset()
+    html_body = md_converter.convert(md_content)
+
+    # 提取标题
+    title = md_path.stem.replace('-', ' ').title()
+    if md_content.startswith('# '):
+        title = md_content.split('\n')[0].replace('# ', '')
+
+    # 生成完整 HTML
+    return HTML_HEAD_START + title + HTML_HEAD_END + html_body + HTML_TAIL.format(name=md_path.name)
+
+
+def _write_html(html_file, data: bytes):
+    """原子写入 HTML 文件 (先写同目录临时文件再重命名，避免读到半个文件)"""
+    html_dir = os.path.dirname(os.path.abspath(html_file))
+    fd, tmp_path = tempfile.mkstemp(dir=html_dir, prefix='.html-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, html_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def convert_md_to_html(md_file: str, html_file: str = None) -> bool:
     """将 Markdown 文件转换为 HTML
 
@@ -118,49 +178,55 @@ def convert_md_to_html(md_file: str, html_file: str = None) -> bool:
     if html_file is None:
         html_file = md_path.with_suffix('.html')
 
-    # 读取 Markdown 内容
-    with open(md_path, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+    # 写入 HTML 文件
+    _write_html(html_file, _render_html(md_path).encode('utf-8'))
 
-    # 转义 HTML 特殊字符
-    md_content = escape_html_in_content(md_content)
+    print(f"HTML 生成成功: {html_file}")
+    return True
 
-    # 转换为 HTML
-    md_converter = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
-    html_body = md_converter.convert(md_content)
 
-    # 提取标题
-    title = md_path.stem.replace('-', ' ').title()
-    if md_content.startswith('# '):
-        title = md_content.split('\n')[0].replace('# ', '')
+def convert_batch(md_files, write_workers: int = 4) -> dict:
+    """批量转换 Markdown 文件为 HTML (共用同一个 Markdown 转换器)
 
-    # 生成完整 HTML
-    html_content = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>{HTML_STYLE}</style>
-</head>
-<body>
-    <div class="container">
-        {html_body}
-        <hr>
-        <div class="meta-info">
-            Generated from: {md_path.name} | Report generated by Code Health Monitor
-        </div>
-    </div>
-</body>
-</html>
-"""
+    渲染在当前线程进行，写文件交给后台线程池，使磁盘写入与下一个文件的转换重叠。
 
-    # 写入 HTML 文件
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    Args:
+        md_files: Markdown 文件路径列表
+        write_workers: 写文件线程数
 
-    print(f"HTML 生成成功: {html_file}")
-    return True
+    Returns:
+        转换结果统计 {'success': int, 'failed': int}
+    """
+    result = {'success': 0, 'failed': 0}
+    if markdown is None:
+        print("请安装 markdown 库: pip install markdown")
+        result['failed'] = len(md_files)
+        return result
+
+    pending = []
+    with ThreadPoolExecutor(max_workers=write_workers) as pool:
+        for md_file in md_files:
+            md_path = Path(md_file)
+            if not md_path.exists():
+                print(f"文件不存在: {md_file}")
+                result['failed'] += 1
+                continue
+
+            html_file = md_path.with_suffix('.html')
+            data = _render_html(md_path).encode('utf-8')
+            pending.append((html_file, pool.submit(_write_html, html_file, data)))
+
+        for html_file, future in pending:
+            try:
+                future.result()
+            except OSError as e:
+                print(f"HTML 写入失败: {html_file} ({e})")
+                result['failed'] += 1
+                continue
+            print(f"HTML 生成成功: {html_file}")
+            result['success'] += 1
+
+    return result
 
 
 def convert_all_reports(reports_dir: str) -> dict:
@@ -173,33 +239,12 @@ def convert_all_reports(reports_dir: str) -> dict:
         转换结果统计 {'success': int, 'failed': int}
     """
     reports_path = Path(reports_dir)
-    result = {'success': 0, 'failed': 0}
 
-    # 转换日报
-    for md_file in (reports_path / 'daily').glob('*.md'):
-        if md_file.name.startswith('example'):
-            continue
-        if convert_md_to_html(str(md_file)):
-            result['success'] += 1
-        else:
-            result['failed'] += 1
-
-    # 转换周报
-    for md_file in (reports_path / 'weekly').glob('*.md'):
-        if md_file.name.startswith('example'):
-            continue
-        if convert_md_to_html(str(md_file)):
-            result['success'] += 1
-        else:
-            result['failed'] += 1
-
-    # 转换月报
-    for md_file in (reports_path / 'monthly').glob('*.md'):
-        if md_file.name.startswith('example'):
-            continue
-        if convert_md_to_html(str(md_file)):
-            result['success'] += 1
-        else:
-            result['failed'] += 1
-
-    return result
+    # 日报、周报、月报
+    md_files = [
+        md_file
+        for sub_dir in ('daily', 'weekly', 'monthly')
+        for md_file in (reports_path / sub_dir).glob('*.md')
+        if not md_file.name.startswith('example')
+    ]
+    return convert_batch(md_files)
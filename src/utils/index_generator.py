@@ -9,6 +9,16 @@ import glob
 from datetime import datetime
 from pathlib import Path
 
+# 月份中文名 (1月..12月)
+_MONTH_CN = [f"{i}月" for i in range(1, 13)]
+
+# 报告链接片段 (链接由 前缀 + 名称 + 中段 + 显示名 + 后缀 拼接)
+_WEEKLY_LINK_PREFIX = '<a href="/reports/weekly/'
+_WEEKLY_LINK_MID = '.html" class="report-link week-link">📑 '
+_DAILY_LINK_PREFIX = '<a href="/reports/daily/'
+_DAILY_LINK_MID = '.html" class="report-link">'
+_LINK_SUFFIX = '</a>'
+
 
 def _is_valid_daily_filename(filename: str) -> bool:
     """验证日报文件名格式 (YYYY-MM-DD)"""
@@ -25,6 +35,25 @@ def _is_valid_monthly_filename(filename: str) -> bool:
     return bool(re.match(r'^\d{4}-\d{2}$', filename))
 
 
+def _list_report_names(report_dir: Path, is_valid) -> list:
+    """列出目录下符合命名格式的 HTML 报告名 (不含扩展名)，按名称倒序
+
+    Args:
+        report_dir: 报告目录
+        is_valid: 文件名格式校验函数
+
+    Returns:
+        报告名列表
+    """
+    names = []
+    for f in sorted(report_dir.glob('*.html'), reverse=True):
+        if f.name.startswith('example'):
+            continue
+        if is_valid(f.stem):
+            names.append(f.stem)
+    return names
+
+
 def generate_index(reports_dir: str, project_name: str = "代码健康监控") -> str:
     """生成报告中心索引页面
 
@@ -50,28 +79,16 @@ def generate_index(reports_dir: str, project_name: str = "代码健康监控") -
         last_year_month = f"{now.year}-{now.month - 1:02d}"
 
     # 获取当月日报 (只包含标准格式文件名)
-    current_month_daily = []
-    for f in sorted(daily_dir.glob('*.html'), reverse=True):
-        if f.name.startswith('example'):
-            continue
-        date_str = f.stem
-        # 验证文件名格式
-        if not _is_valid_daily_filename(date_str):
-            continue
-        if date_str[:7] == current_year_month:
-            current_month_daily.append(date_str)
+    current_month_daily = [
+        d for d in _list_report_names(daily_dir, _is_valid_daily_filename)
+        if d[:7] == current_year_month
+    ]
 
     # 获取当年周报 (只包含标准格式文件名)
-    current_year_weekly = []
-    for f in sorted(weekly_dir.glob('*.html'), reverse=True):
-        if f.name.startswith('example'):
-            continue
-        week_str = f.stem
-        # 验证文件名格式
-        if not _is_valid_weekly_filename(week_str):
-            continue
-        if week_str.startswith(str(now.year)):
-            current_year_weekly.append(week_str)
+    current_year_weekly = [
+        w for w in _list_report_names(weekly_dir, _is_valid_weekly_filename)
+        if w.startswith(str(now.year))
+    ]
 
     # 获取上月月报
     last_month_report = None
@@ -82,27 +99,27 @@ def generate_index(reports_dir: str, project_name: str = "代码健康监控") -
     total_weekly = len(current_year_weekly)
 
     # 生成周报链接
-    weekly_links = "\n".join([
-        f'<a href="/reports/weekly/{w}.html" class="report-link week-link">📑 {w}</a>'
+    weekly_links = "\n".join(
+        _WEEKLY_LINK_PREFIX + w + _WEEKLY_LINK_MID + w + _LINK_SUFFIX
         for w in current_year_weekly
-    ])
+    )
 
     # 生成日报链接
-    daily_links = "\n".join([
-        f'<a href="/reports/daily/{d}.html" class="report-link">{d[5:]}</a>'
+    daily_links = "\n".join(
+        _DAILY_LINK_PREFIX + d + _DAILY_LINK_MID + d[5:] + _LINK_SUFFIX
         for d in current_month_daily
-    ])
+    )
 
     # 月报部分
     year, month = current_year_month.split('-')
-    month_name = f"{year}年{int(month)}月"
+    month_name = f"{year}年{_MONTH_CN[int(month) - 1]}"
 
     monthly_section = ""
     if last_month_report:
         ly, lm = last_year_month.split('-')
         monthly_section = f'''
         <div class="section">
-            <h2>📊 月报 ({ly}年{int(lm)}月)</h2>
+            <h2>📊 月报 ({ly}年{_MONTH_CN[int(lm) - 1]})</h2>
             <div class="report-grid">
                 <a href="/reports/monthly/{last_year_month}.html" class="report-link month-link">📄 {last_year_month} 月报</a>
             </div>
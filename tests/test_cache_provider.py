@@ -0,0 +1,55 @@
+"""
+CachedProvider 时间窗口边界测试
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+from src.providers.base import CommitInfo, FileChange
+from src.providers.cache import CachedProvider
+
+
+def _days_ago(days: int) -> str:
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def _commit(hash_: str) -> CommitInfo:
+    return CommitInfo(
+        hash=hash_,
+        author='dev',
+        email='dev@example.com',
+        date=f"{_days_ago(1)} 10:00:00",
+        message='update',
+        files=[FileChange(path='a.py', added=1, deleted=0)],
+    )
+
+
+def test_window_ending_today_is_not_closed():
+    # 日报在凌晨运行时 until 为今天 00:00，当天仍可能有新提交
+    assert not CachedProvider._is_closed_window(_days_ago(1), _days_ago(0))
+    assert not CachedProvider._is_closed_window(_days_ago(1), f"{_days_ago(0)}T00:00:00")
+
+
+def test_window_ending_before_today_is_closed():
+    assert CachedProvider._is_closed_window(_days_ago(2), _days_ago(1))
+    assert CachedProvider._is_closed_window(_days_ago(40), f"{_days_ago(1)}T23:59:59")
+
+
+def test_relative_or_open_window_is_not_closed():
+    assert not CachedProvider._is_closed_window('7 days ago', _days_ago(1))
+    assert not CachedProvider._is_closed_window(_days_ago(7), None)
+
+
+def test_only_closed_windows_are_cached(tmp_path):
+    inner = mock.Mock(max_workers=8)
+    inner.get_commits.side_effect = [[_commit('a')], [_commit('b')], [_commit('c')]]
+    provider = CachedProvider(inner, str(tmp_path))
+
+    # 结束日期为今天：每次都请求被包装的 Provider
+    assert provider.get_commits('org/repo', _days_ago(1), _days_ago(0))[0].hash == 'a'
+    assert provider.get_commits('org/repo', _days_ago(1), _days_ago(0))[0].hash == 'b'
+
+    # 已结束的窗口：第二次读取缓存
+    assert provider.get_commits('org/repo', _days_ago(2), _days_ago(1))[0].hash == 'c'
+    assert provider.get_commits('org/repo', _days_ago(2), _days_ago(1))[0].hash == 'c'
+    assert inner.get_commits.call_count == 3